@@ -1101,5 +1101,43 @@ def analyze():
     run_analysis()
 
 
+@app.command("compile-data")
+def compile_data(
+    data_dir: Optional[Path] = typer.Option(
+        None, help="Data directory to compile, defaults to the configured data_dir."
+    ),
+    force: bool = typer.Option(False, help="Rebuild everything, ignoring the manifest."),
+    verify: bool = typer.Option(
+        False, help="Checksum files whose mtime and size are unchanged as well."
+    ),
+):
+    """Compile price, finnhub and SimFin data into their indexed binary layouts."""
+    from tradingagents.dataflows.data_compiler import compile_data_dir
+
+    data_dir = str(data_dir or DEFAULT_CONFIG["data_dir"])
+    if not Path(data_dir).is_dir():
+        console.print(f"[red]Data directory not found: {data_dir}[/red]")
+        raise typer.Exit(1)
+
+    with console.status(f"Compiling {data_dir}...") as status:
+        summary = compile_data_dir(
+            data_dir,
+            force=force,
+            verify=verify,
+            progress=lambda kind, path, state: status.update(
+                f"[{kind}] {Path(path).name}: {state}"
+            ),
+        )
+
+    table = Table(title="Compiled data", box=box.SIMPLE_HEAD)
+    states = ["built", "unchanged", "failed"]
+    table.add_column("Source")
+    for state in states:
+        table.add_column(state.capitalize(), justify="right")
+    for kind, counts in summary.items():
+        table.add_row(kind, *(str(counts.get(state, 0)) for state in states))
+    console.print(table)
+
+
 if __name__ == "__main__":
     app()
@@ -0,0 +1,85 @@
+"""Time the Reddit date-index scan against a full JSON decode of every post.
+
+Compares ``json.loads`` plus ``utcfromtimestamp`` with the byte prefilter
+used by :class:`RedditIndex`, checks both assign every post the same day,
+and times a complete index build. Generate a corpus first with
+``scripts/make_reddit_corpus.py``.
+
+    python scripts/bench_reddit_index.py /tmp/data
+
+Run it from the repository root with the package installed.
+"""
+
+import argparse
+import glob
+import json
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime
+
+from tradingagents.dataflows.reddit_utils import RedditIndex, _post_date
+
+
+def _scan(path: str, post_date) -> list:
+    rows = []
+    offset = 0
+    with open(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                rows.append((post_date(line), offset, len(line)))
+            offset += len(line)
+    return rows
+
+
+def _decoded_date(line: bytes) -> str:
+    created_utc = json.loads(line)["created_utc"]
+    return datetime.utcfromtimestamp(created_utc).strftime("%Y-%m-%d")
+
+
+def _timed(run, paths):
+    start = time.perf_counter()
+    results = [run(path) for path in paths]
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("data_dir", help="directory holding reddit_data")
+    args = parser.parse_args()
+
+    paths = sorted(
+        glob.glob(os.path.join(args.data_dir, "reddit_data", "*", "*.jsonl"))
+    )
+    size = sum(os.path.getsize(path) for path in paths)
+
+    decoded_s, decoded = _timed(lambda path: _scan(path, _decoded_date), paths)
+    prefilter_s, prefiltered = _timed(lambda path: _scan(path, _post_date), paths)
+    posts = sum(len(rows) for rows in decoded)
+
+    store_root = tempfile.mkdtemp()
+    try:
+        build_s, _ = _timed(
+            lambda path: RedditIndex.build(
+                path,
+                os.path.join(store_root, os.path.basename(path)),
+                os.stat(path),
+            ),
+            paths,
+        )
+    finally:
+        shutil.rmtree(store_root, ignore_errors=True)
+
+    print(f"{size / 1e9:.2f} GB, {posts} posts in {len(paths)} files")
+    print(f"  json.loads + utcfromtimestamp  {decoded_s:6.1f} s")
+    print(
+        f"  byte prefilter                 {prefilter_s:6.1f} s"
+        f"  ({decoded_s / prefilter_s:.1f}x)"
+    )
+    print(f"  full RedditIndex.build         {build_s:6.1f} s")
+    print(f"  same day for every post: {decoded == prefiltered}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Write a synthetic Reddit corpus shaped like ``data_dir/reddit_data``.
+
+Posts follow the layout of the real dumps (one JSON object per line) and
+include the cases the date index has to get right: fractional and
+day-boundary timestamps, non-ASCII text with and without escaping, blank
+lines and crossposts carrying a nested ``created_utc``.
+
+    python scripts/make_reddit_corpus.py /tmp/data --size-gb 2
+"""
+
+import argparse
+import json
+import os
+import random
+
+WORDS = (
+    "market stock rally crash earnings guidance chip cloud AI rate fed "
+    "inflation über café"
+).split()
+COMPANIES = (
+    "Apple Microsoft MSFT Nvidia TSMC Meta facebook Twitter ASML AMD"
+).split() + ["JP Morgan", "Snap Inc."]
+SUBREDDITS = {
+    "global_news": ["worldnews", "news", "economics"],
+    "company_news": ["stocks", "investing", "wallstreetbets", "StockMarket"],
+}
+START = 1672531200  # 2023-01-01 UTC
+DAYS = 400
+
+
+def _timestamp(rng: random.Random) -> float:
+    ts = START + rng.randint(0, DAYS * 86400)
+    roll = rng.random()
+    if roll < 0.1:
+        return ts + rng.random()
+    if roll < 0.11:
+        # the last representable instant of a day and the first of the next
+        return ts // 86400 * 86400 + rng.choice([0, 86399.9999999])
+    return ts
+
+
+def _post(rng: random.Random, subreddit: str, i: int, company_news: bool) -> dict:
+    title = " ".join(rng.choices(WORDS, k=6))
+    selftext = " ".join(rng.choices(WORDS, k=rng.randint(0, 60)))
+    if company_news and rng.random() < 0.3:
+        title += " " + rng.choice(COMPANIES)
+    post = {
+        "id": f"{subreddit}{i}",
+        "title": title,
+        "selftext": selftext,
+        "created_utc": _timestamp(rng),
+        "ups": rng.randint(0, 5000),
+        "num_comments": rng.randint(0, 999),
+        "url": f"https://www.reddit.com/r/{subreddit}/comments/{i}",
+    }
+    if rng.random() < 0.005:
+        post["crosspost_parent_list"] = [{"created_utc": _timestamp(rng)}]
+    return post
+
+
+def write_corpus(data_dir: str, size_bytes: int, seed: int = 7):
+    """Write about ``size_bytes`` of posts spread evenly over the subreddits."""
+    rng = random.Random(seed)
+    files = [
+        (category, subreddit)
+        for category, subreddits in SUBREDDITS.items()
+        for subreddit in subreddits
+    ]
+    per_file = size_bytes // len(files)
+    for category, subreddit in files:
+        category_dir = os.path.join(data_dir, "reddit_data", category)
+        os.makedirs(category_dir, exist_ok=True)
+        path = os.path.join(category_dir, f"{subreddit}.jsonl")
+        written = 0
+        i = 0
+        with open(path, "w", encoding="utf-8") as f:
+            while written < per_file:
+                post = _post(rng, subreddit, i, category == "company_news")
+                line = json.dumps(post, ensure_ascii=rng.random() < 0.5) + "\n"
+                if rng.random() < 0.001:
+                    line += "\n"
+                written += f.write(line)
+                i += 1
+        print(f"{path}: {i} posts")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("data_dir", help="directory to create reddit_data in")
+    parser.add_argument("--size-gb", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    write_corpus(args.data_dir, int(args.size_gb * 1e9), args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+import contextlib
+import io
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from tradingagents.dataflows import googlenews_utils
+from tradingagents.dataflows.config import get_config, set_config
+from tradingagents.dataflows.feednews_utils import getFeedNewsData
+
+GOOGLE_NEWS_RSS = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>"apple stock" - Google News</title>
+<item><title>Apple shares rise</title><link>https://news.test/a1</link>
+<pubDate>Mon, 08 Jan 2024 14:00:00 GMT</pubDate><description>Rally</description>
+<source url="https://reuters.test">Reuters</source></item>
+<item><title>Apple stock last year</title><link>https://news.test/a0</link>
+<pubDate>Sun, 01 Jan 2023 14:00:00 GMT</pubDate><description>Old</description>
+<source url="https://old.test">Old</source></item>
+<item><title>Supplier update</title><link>https://news.test/a2</link>
+<pubDate>Wed, 03 Jan 2024 09:00:00 GMT</pubDate><description>Chips</description>
+<source url="https://bloomberg.test">Bloomberg</source></item>
+</channel></rss>"""
+
+PUBLISHER_ATOM = """<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>Publisher Markets</title>
+<entry><title>Why Apple stock fell</title><link href="https://pub.test/p1"/>
+<updated>2024-01-07T10:00:00Z</updated><summary>Analysts weigh in.</summary></entry>
+<entry><title>Oil prices climb</title><link href="https://pub.test/p2"/>
+<updated>2024-01-07T11:00:00Z</updated><summary>Crude rallies.</summary></entry>
+<entry><title>Apple shares rise</title><link href="https://news.test/a1"/>
+<updated>2024-01-08T10:00:00Z</updated><summary>Stock rally.</summary></entry>
+<entry><title>Apple stock in 2023</title><link href="https://pub.test/p0"/>
+<updated>2023-12-30T10:00:00Z</updated><summary>Review.</summary></entry>
+</feed>"""
+
+
+class FeedStandIn(BaseHTTPRequestHandler):
+    """Serves the Google News RSS search, one publisher Atom feed and 404s."""
+
+    protocol_version = "HTTP/1.1"
+    requests = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.requests.append(self.path)
+        if self.path.startswith("/rss/search"):
+            status, body = 200, GOOGLE_NEWS_RSS
+        elif self.path == "/publisher.atom":
+            status, body = 200, PUBLISHER_ATOM
+        else:
+            status, body = 404, "not found"
+        body = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class FeedNewsTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), FeedStandIn)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.saved_config = get_config()
+        base = f"http://127.0.0.1:{self.server.server_port}"
+        set_config(
+            {
+                "google_news_rss_url": f"{base}/rss/search",
+                "news_feed_urls": [f"{base}/publisher.atom", f"{base}/missing.xml"],
+                "google_news_requests_per_second": 100.0,
+                "google_news_burst": 100,
+            }
+        )
+        FeedStandIn.requests.clear()
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.news = getFeedNewsData("apple+stock", "2024-01-01", "2024-01-08")
+        self.output = output.getvalue()
+
+    def tearDown(self):
+        set_config(self.saved_config)
+
+    def links(self):
+        return [news["link"] for news in self.news]
+
+    def test_entries_outside_window_are_dropped(self):
+        self.assertNotIn("https://news.test/a0", self.links())
+        self.assertNotIn("https://pub.test/p0", self.links())
+
+    def test_publisher_entries_must_mention_query(self):
+        self.assertIn("https://pub.test/p1", self.links())
+        self.assertNotIn("https://pub.test/p2", self.links())
+        # the Google News search already matched the query
+        self.assertIn("https://news.test/a2", self.links())
+
+    def test_duplicate_links_are_kept_once(self):
+        self.assertEqual(self.links().count("https://news.test/a1"), 1)
+        first = self.news[0]
+        self.assertEqual((first["source"], first["snippet"]), ("Reuters", "Rally"))
+
+    def test_newest_first(self):
+        self.assertEqual(
+            self.links(),
+            ["https://news.test/a1", "https://pub.test/p1", "https://news.test/a2"],
+        )
+        self.assertEqual(
+            [news["date"] for news in self.news],
+            ["2024-01-08", "2024-01-07", "2024-01-03"],
+        )
+
+    def test_failed_feed_is_skipped(self):
+        self.assertIn("/missing.xml", FeedStandIn.requests)
+        self.assertIn("missing.xml: 404", self.output)
+        self.assertEqual(len(self.news), 3)
+
+    def test_only_google_news_is_rate_limited(self):
+        limiter = mock.Mock(wraps=googlenews_utils.get_rate_limiter())
+        with mock.patch.object(
+            googlenews_utils, "get_rate_limiter", return_value=limiter
+        ), contextlib.redirect_stdout(io.StringIO()):
+            getFeedNewsData("apple+stock", "2024-01-01", "2024-01-08")
+        self.assertEqual(limiter.acquire.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import asyncio
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+from tenacity import wait_none
+
+from tradingagents.dataflows import googlenews_utils
+from tradingagents.dataflows.config import get_config, set_config
+
+
+class GoogleNewsStandIn(BaseHTTPRequestHandler):
+    """Google News search results: ``pagesN`` in the query sets how many
+    pages it has, and ``throttle`` answers its third page with a 429 once."""
+
+    protocol_version = "HTTP/1.1"
+    requests = []
+    client_ports = []
+    throttled = set()
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        params = parse_qs(urlparse(self.path).query)
+        query = params["q"][0]
+        page = int(params["start"][0]) // 10
+        self.requests.append((query, page))
+        self.client_ports.append(self.client_address[1])
+
+        pages = int(query.split("pages")[1]) if "pages" in query else 5
+        if "throttle" in query and page == 2 and query not in self.throttled:
+            self.throttled.add(query)
+            self._send(429, b"slow down")
+            return
+        results = "".join(
+            f'<div class="SoaBEf"><a href="https://news.test/{query}/{page}/{i}"></a>'
+            f'<div class="MBeuO">{query} {page}-{i}</div>'
+            '<div class="GI74Re">snippet</div><div class="LfVVr">1 day ago</div>'
+            '<div class="NUnG9d"><span>Source</span></div></div>'
+            for i in range(10 if page < pages else 0)
+        )
+        next_link = '<a id="pnnext" href="#">Next</a>' if page < pages - 1 else ""
+        self._send(200, f"<html><body>{results}{next_link}</body></html>".encode())
+
+    def _send(self, status: int, body: bytes):
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class GoogleNewsTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), GoogleNewsStandIn)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.saved_config = get_config()
+        port = self.server.server_port
+        set_config(
+            {
+                "google_news_base_url": f"http://127.0.0.1:{port}/search",
+                "google_news_requests_per_second": 100.0,
+                "google_news_burst": 100,
+                "google_news_page_concurrency": 3,
+            }
+        )
+        GoogleNewsStandIn.requests.clear()
+        GoogleNewsStandIn.client_ports.clear()
+        retry = googlenews_utils.make_request_async.retry
+        patcher = mock.patch.object(retry, "wait", wait_none())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        set_config(self.saved_config)
+
+    def titles(self, query: str):
+        news = googlenews_utils.getNewsData(query, "2024-01-01", "2024-01-08")
+        return [item["title"] for item in news]
+
+    def test_pages_are_returned_in_order(self):
+        expected = [f"pages5 {page}-{i}" for page in range(5) for i in range(10)]
+        self.assertEqual(self.titles("pages5"), expected)
+
+    def test_first_page_is_fetched_alone(self):
+        self.assertEqual(len(self.titles("pages1")), 10)
+        self.assertEqual(GoogleNewsStandIn.requests, [("pages1", 0)])
+
+        GoogleNewsStandIn.requests.clear()
+        self.titles("pages5")
+        pages = [page for _, page in GoogleNewsStandIn.requests]
+        self.assertEqual(pages[0], 0)
+        self.assertEqual(sorted(pages[1:4]), [1, 2, 3])
+
+    def test_rate_limited_page_is_retried(self):
+        expected = [f"throttle {page}-{i}" for page in range(5) for i in range(10)]
+        self.assertEqual(self.titles("throttle"), expected)
+        pages = [page for _, page in GoogleNewsStandIn.requests]
+        self.assertEqual(pages.count(2), 2)
+
+    def test_sync_call_inside_running_loop(self):
+        async def fetch():
+            return self.titles("pages2")
+
+        self.assertEqual(len(asyncio.run(fetch())), 20)
+
+    def test_sync_calls_share_connections(self):
+        self.titles("pages1")
+        self.titles("pages1")
+        self.assertEqual(len(GoogleNewsStandIn.requests), 2)
+        self.assertEqual(len(set(GoogleNewsStandIn.client_ports)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
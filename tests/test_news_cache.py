@@ -0,0 +1,152 @@
+import contextlib
+import io
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from tradingagents.dataflows import news_cache
+from tradingagents.dataflows.config import get_config, set_config
+from tradingagents.dataflows.googlenews_utils import getNewsDataByDay
+
+
+class DailyNewsStandIn(BaseHTTPRequestHandler):
+    """One page of two results per one-day search; days in ``failing_days``
+    (mm/dd/yyyy) are answered with a 503."""
+
+    protocol_version = "HTTP/1.1"
+    days = []
+    failing_days = set()
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        params = parse_qs(urlparse(self.path).query)
+        query = params["q"][0]
+        day = params["tbs"][0].split("cd_min:")[1].split(",")[0]
+        self.days.append(day)
+
+        if day in self.failing_days:
+            self._send(503, b"service unavailable")
+            return
+        results = "".join(
+            f'<div class="SoaBEf"><a href="https://news.test/{day}/{i}"></a>'
+            f'<div class="MBeuO">{query} {day} {i}</div>'
+            '<div class="GI74Re">snippet</div><div class="LfVVr">1 day ago</div>'
+            '<div class="NUnG9d"><span>Source</span></div></div>'
+            for i in range(2)
+        )
+        self._send(200, f"<html><body>{results}</body></html>".encode())
+
+    def _send(self, status: int, body: bytes):
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class NewsCacheTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), DailyNewsStandIn)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.saved_config = get_config()
+        self.cache_dir = tempfile.mkdtemp()
+        port = self.server.server_port
+        set_config(
+            {
+                "data_cache_dir": self.cache_dir,
+                "google_news_base_url": f"http://127.0.0.1:{port}/search",
+                "google_news_requests_per_second": 100.0,
+                "google_news_burst": 100,
+                "google_news_today_ttl_seconds": 3600,
+            }
+        )
+        DailyNewsStandIn.days.clear()
+        DailyNewsStandIn.failing_days.clear()
+
+    def tearDown(self):
+        set_config(self.saved_config)
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def titles(self, start_date: str, end_date: str):
+        news = getNewsDataByDay("apple", start_date, end_date)
+        return [item["title"] for item in news]
+
+    def test_cold_fetch_then_warm_hit(self):
+        expected = [
+            f"apple {day} {i}"
+            for day in ("01/03/2024", "01/02/2024", "01/01/2024")
+            for i in range(2)
+        ]
+        self.assertEqual(self.titles("2024-01-01", "2024-01-03"), expected)
+        self.assertEqual(
+            sorted(DailyNewsStandIn.days), ["01/01/2024", "01/02/2024", "01/03/2024"]
+        )
+        self.assertEqual(len(news_cache.load_day("apple", "2024-01-02")), 2)
+
+        DailyNewsStandIn.days.clear()
+        self.assertEqual(self.titles("2024-01-01", "2024-01-03"), expected)
+        self.assertEqual(DailyNewsStandIn.days, [])
+
+    def test_overlapping_window_fetches_new_days_only(self):
+        self.titles("2024-01-01", "2024-01-03")
+        DailyNewsStandIn.days.clear()
+        self.titles("2024-01-02", "2024-01-04")
+        self.assertEqual(DailyNewsStandIn.days, ["01/04/2024"])
+
+    def test_today_expires_after_ttl(self):
+        today = date.today()
+        results = [{"title": "cached"}]
+        fetched_at = time.time()
+        news_cache.save_day("apple", today.isoformat(), results, now=fetched_at)
+        self.assertEqual(
+            news_cache.load_day("apple", today.isoformat(), now=fetched_at + 3599),
+            results,
+        )
+        self.assertIsNone(
+            news_cache.load_day("apple", today.isoformat(), now=fetched_at + 3601)
+        )
+
+        # a past day fetched after it ended never expires
+        news_cache.save_day("apple", "2024-01-01", results, now=fetched_at)
+        self.assertEqual(
+            news_cache.load_day("apple", "2024-01-01", now=fetched_at + 10**9),
+            results,
+        )
+
+        news_cache.save_day("apple", today.isoformat(), results, now=fetched_at - 7200)
+        titles = self.titles(today.isoformat(), today.isoformat())
+        self.assertEqual(DailyNewsStandIn.days, [today.strftime("%m/%d/%Y")])
+        self.assertNotIn("cached", titles)
+
+    def test_failed_day_is_not_cached(self):
+        DailyNewsStandIn.failing_days.add("01/02/2024")
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            titles = self.titles("2024-01-01", "2024-01-03")
+        self.assertEqual(len(titles), 4)
+        self.assertIn("503", output.getvalue())
+        self.assertIsNone(news_cache.load_day("apple", "2024-01-02"))
+        self.assertIsNotNone(news_cache.load_day("apple", "2024-01-03"))
+
+        DailyNewsStandIn.failing_days.clear()
+        DailyNewsStandIn.days.clear()
+        self.assertEqual(len(self.titles("2024-01-01", "2024-01-03")), 6)
+        self.assertEqual(DailyNewsStandIn.days, ["01/02/2024"])
+
+
+if __name__ == "__main__":
+    unittest.main()
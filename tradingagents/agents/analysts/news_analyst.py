@@ -8,13 +8,19 @@ def create_news_analyst(llm, toolkit):
         current_date = state["trade_date"]
         ticker = state["company_of_interest"]
 
+        # search-result scraping or RSS/Atom feeds, per the news_provider config
+        if toolkit.config["news_provider"] == "feeds":
+            search_news = toolkit.get_feed_news
+        else:
+            search_news = toolkit.get_google_news
+
         if toolkit.config["online_tools"]:
-            tools = [toolkit.get_global_news_openai, toolkit.get_google_news]
+            tools = [toolkit.get_global_news_openai, search_news]
         else:
             tools = [
                 toolkit.get_finnhub_news,
                 toolkit.get_reddit_news,
-                toolkit.get_google_news,
+                search_news,
             ]
 
         system_message = (
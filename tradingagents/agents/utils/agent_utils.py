@@ -48,6 +48,11 @@ class Toolkit:
         if config:
             self.update_config(config)
 
+    def prefetch_market_data(self, symbols: List[str]):
+        """Warm the price data of all symbols before a batch of propagations,
+        so the market tools do not download or parse it one symbol at a time."""
+        return interface.prefetch_YFin_data(symbols, self.config["online_tools"])
+
     @staticmethod
     @tool
     def get_reddit_news(
@@ -136,7 +141,7 @@ class Toolkit:
             str: A formatted dataframe containing the stock price data for the specified ticker symbol in the specified date range.
         """
 
-        result_data = interface.get_YFin_data(symbol, start_date, end_date)
+        result_data = interface.get_YFin_data_report(symbol, start_date, end_date)
 
         return result_data
 
@@ -341,6 +346,30 @@ class Toolkit:
 
         return data_income_stmt
 
+    @staticmethod
+    @tool
+    def get_fundamentals_bundle(
+        ticker: Annotated[str, "ticker symbol"],
+        curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
+        freq: Annotated[
+            str,
+            "reporting frequency of the company's financial history: annual/quarterly",
+        ] = "quarterly",
+    ):
+        """
+        Retrieve all fundamentals of a company in one call: the most recent balance sheet, cash flow statement and income statement, plus insider sentiment and insider transactions for the past 30 days
+        Args:
+            ticker (str): ticker symbol of the company
+            curr_date (str): current date you are trading at, yyyy-mm-dd
+            freq (str): reporting frequency of the company's financial history: annual / quarterly, defaults to quarterly
+        Returns:
+            str: one report with a section for each kind of fundamental data that is available
+        """
+
+        data_bundle = interface.get_fundamentals_bundle(ticker, curr_date, freq, 30)
+
+        return data_bundle
+
     @staticmethod
     @tool
     def get_google_news(
@@ -361,6 +390,25 @@ class Toolkit:
 
         return google_news_results
 
+    @staticmethod
+    @tool
+    def get_feed_news(
+        query: Annotated[str, "Query to search with"],
+        curr_date: Annotated[str, "Curr date in yyyy-mm-dd format"],
+    ):
+        """
+        Retrieve the latest news from Google News and publisher RSS feeds based on a query, for the past 7 days.
+        Args:
+            query (str): Query to search with
+            curr_date (str): Current date in yyyy-mm-dd format
+        Returns:
+            str: A formatted string containing the latest news from the feeds based on the query and date range.
+        """
+
+        feed_news_results = interface.get_feed_news(query, curr_date, 7)
+
+        return feed_news_results
+
     @staticmethod
     @tool
     def get_stock_news_openai(
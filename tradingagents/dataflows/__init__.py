@@ -1,8 +1,11 @@
 from .finnhub_utils import get_data_in_range
 from .googlenews_utils import getNewsData
+from .feednews_utils import getFeedNewsData
 from .yfin_utils import YFinanceUtils
-from .reddit_utils import fetch_top_from_category
+from .reddit_utils import fetch_top_from_category, fetch_top_from_category_range
 from .stockstats_utils import StockstatsUtils
+from .indicator_cache import get_indicator_cache_stats
+from .compact_format import get_tool_output_stats
 from .yfin_utils import YFinanceUtils
 
 from .interface import (
@@ -11,18 +14,24 @@ from .interface import (
     get_finnhub_company_insider_sentiment,
     get_finnhub_company_insider_transactions,
     get_google_news,
+    get_feed_news,
     get_reddit_global_news,
     get_reddit_company_news,
     # Financial statements functions
     get_simfin_balance_sheet,
     get_simfin_cashflow,
     get_simfin_income_statements,
+    get_simfin_statements_as_of,
+    get_fundamentals_memory_usage,
+    get_fundamentals_bundle,
     # Technical analysis functions
     get_stock_stats_indicators_window,
     get_stockstats_indicator,
     # Market data functions
     get_YFin_data_window,
     get_YFin_data,
+    get_YFin_data_report,
+    prefetch_YFin_data,
 )
 
 __all__ = [
@@ -31,16 +40,26 @@ __all__ = [
     "get_finnhub_company_insider_sentiment",
     "get_finnhub_company_insider_transactions",
     "get_google_news",
+    "get_feed_news",
     "get_reddit_global_news",
     "get_reddit_company_news",
     # Financial statements functions
     "get_simfin_balance_sheet",
     "get_simfin_cashflow",
     "get_simfin_income_statements",
+    "get_simfin_statements_as_of",
+    "get_fundamentals_memory_usage",
+    "get_fundamentals_bundle",
     # Technical analysis functions
     "get_stock_stats_indicators_window",
     "get_stockstats_indicator",
     # Market data functions
     "get_YFin_data_window",
     "get_YFin_data",
+    "get_YFin_data_report",
+    "prefetch_YFin_data",
+    # Cache statistics
+    "get_indicator_cache_stats",
+    # Tool output statistics
+    "get_tool_output_stats",
 ]
@@ -0,0 +1,172 @@
+"""Compact text rendering of tabular tool output.
+
+Tool results end up verbatim in the analysts' prompts, so price and
+indicator tables are rendered as plain CSV with fixed precision. Columns
+that carry no information (constant, or identical to another column) are
+reduced to a one-line note. Rows can be delta encoded, and they are evenly
+downsampled when the table would not fit a token budget. Every call records
+how much shorter its output is than the full-precision CSV of the same data.
+"""
+
+import math
+import threading
+from typing import Annotated, Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .config import get_config
+
+# rough size of a token for the estimates below, no tokenizer is involved
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+class SerializerStats:
+    """Running totals of what the compact rendering saved."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.reference_chars = 0
+        self.output_chars = 0
+
+    def record(self, reference_chars: int, output_chars: int):
+        with self._lock:
+            self.calls += 1
+            self.reference_chars += reference_chars
+            self.output_chars += output_chars
+
+    def reset(self):
+        with self._lock:
+            self.calls = 0
+            self.reference_chars = 0
+            self.output_chars = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            saved = self.reference_chars - self.output_chars
+            return {
+                "calls": self.calls,
+                "reference_chars": self.reference_chars,
+                "output_chars": self.output_chars,
+                "chars_saved": saved,
+                "tokens_saved": math.ceil(saved / CHARS_PER_TOKEN),
+                "ratio": (
+                    self.output_chars / self.reference_chars
+                    if self.reference_chars
+                    else 1.0
+                ),
+            }
+
+
+_stats = SerializerStats()
+
+
+def get_tool_output_stats() -> Dict[str, Any]:
+    """Characters and estimated tokens saved by the compact tool output."""
+    return _stats.stats()
+
+
+def _redundant_columns(data: pd.DataFrame, keep: Sequence[str]) -> List[str]:
+    """Notes for the columns that can be dropped, and drop them from ``data``."""
+    notes = []
+    if len(data) < 2:
+        return notes
+    for name in list(data.columns):
+        if name in keep:
+            continue
+        values = data[name]
+        if values.nunique(dropna=False) == 1:
+            notes.append(f"{name}={values.iloc[0]} on every row")
+            del data[name]
+            continue
+        for other in data.columns:
+            if other != name and values.equals(data[other]):
+                notes.append(f"{name} equals {other}")
+                del data[name]
+                break
+    return notes
+
+
+def _delta_encode(data: pd.DataFrame, keep: Sequence[str]) -> pd.DataFrame:
+    """Replace numeric columns by row-to-row changes, keeping the first row."""
+    data = data.copy()
+    for name in data.columns:
+        if name in keep or not pd.api.types.is_numeric_dtype(data[name]):
+            continue
+        values = data[name].to_numpy()
+        deltas = values.copy()
+        deltas[1:] = values[1:] - values[:-1]
+        data[name] = deltas
+    return data
+
+
+def format_table(
+    data: Annotated[pd.DataFrame, "table to render, index is not printed"],
+    precision: Annotated[Optional[int], "decimals kept for floats"] = None,
+    drop_redundant: Annotated[bool, "fold constant/duplicate columns into a note"] = True,
+    delta: Annotated[Optional[bool], "print changes from the previous row"] = None,
+    token_budget: Annotated[Optional[int], "downsample rows to fit this size"] = None,
+    keep_columns: Annotated[Sequence[str], "columns never dropped or delta encoded"] = ("Date",),
+) -> str:
+    """Render ``data`` as compact CSV.
+
+    ``precision``, ``delta`` and ``token_budget`` default to the
+    ``tool_output_precision``, ``tool_output_delta`` and
+    ``tool_output_token_budget`` config values. Downsampling always keeps the
+    first and the last row.
+    """
+    config = get_config()
+    if precision is None:
+        precision = config["tool_output_precision"]
+    if delta is None:
+        delta = config["tool_output_delta"]
+    if token_budget is None:
+        token_budget = config["tool_output_token_budget"]
+
+    reference_chars = len(data.to_csv(index=False))
+
+    data = data.reset_index(drop=True)
+    if precision is not None:
+        floats = data.select_dtypes(include="floating").columns
+        data[floats] = data[floats].round(precision)
+    float_format = f"%.{precision}f" if precision is not None else None
+
+    notes = _redundant_columns(data, keep_columns) if drop_redundant else []
+
+    rows = len(data)
+    if token_budget and rows > 2:
+        size = estimate_tokens(data.to_csv(index=False, float_format=float_format))
+        if size > token_budget:
+            step = math.ceil(size / token_budget)
+            picked = np.unique(np.r_[np.arange(0, rows, step), rows - 1])
+            data = data.iloc[picked]
+            notes.append(f"1 in {step} of {rows} rows shown, first and last kept")
+
+    if delta and len(data) > 1:
+        data = _delta_encode(data, keep_columns)
+        if precision is not None:
+            data = data.round(precision)
+        notes.append("rows after the first hold the change from the previous row")
+
+    text = "".join(f"# {note}\n" for note in notes)
+    text += data.to_csv(index=False, float_format=float_format)
+
+    _stats.record(reference_chars, len(text))
+    return text
+
+
+def format_series(
+    values: Annotated[pd.Series, "values indexed by label, e.g. by date"],
+    index_label: str = "Date",
+    value_label: str = "value",
+    **kwargs,
+) -> str:
+    """:func:`format_table` for a single labelled column, which is always
+    printed, even when it is constant."""
+    frame = pd.DataFrame({index_label: values.index, value_label: values.values})
+    return format_table(frame, keep_columns=(index_label, value_label), **kwargs)
@@ -0,0 +1,214 @@
+"""Compile the raw files of a data directory into their indexed layouts.
+
+The query functions build these layouts lazily on first use; running the
+compiler ahead of time moves that cost out of the request path. A manifest
+in ``data_cache_dir`` records the mtime, size and SHA-256 of every source,
+per data directory, so later runs only rebuild what changed.
+"""
+
+import functools
+import glob
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime
+from typing import Annotated, Callable, Dict, List, Optional, Tuple
+
+from . import finnhub_utils, fundamentals_index, price_store, reddit_utils
+from .config import get_config
+from .store_utils import StoreCache, meta_is_current
+
+MANIFEST_NAME = "compiled_data_manifest.json"
+
+
+class _StoreCompiler:
+    """Builds the stores of one kind of source through its lazy getter.
+
+    The stores check themselves against the source's mtime and size only,
+    so a content change that kept both needs the old store removed first,
+    and the store the getter cached in this process is dropped so it
+    really rebuilds. A getter returning None means the store could not be
+    written.
+    """
+
+    def __init__(
+        self,
+        build: Callable[[str], object],
+        store_dir_for: Callable[[str], str],
+        version: int,
+        cache: StoreCache,
+    ):
+        self.build = build
+        self.store_dir_for = store_dir_for
+        self.version = version
+        self.cache = cache
+
+    def is_current(self, path: str, source_stat: os.stat_result) -> bool:
+        return meta_is_current(
+            self.store_dir_for(path), path, source_stat, self.version
+        )
+
+    def compile(self, path: str, rebuild: bool):
+        if rebuild:
+            shutil.rmtree(self.store_dir_for(path), ignore_errors=True)
+        self.cache.invalidate(path)
+        if self.build(path) is None:
+            raise OSError("no store could be written")
+
+
+# kind -> (glob below data_dir, compiler)
+COMPILERS: Dict[str, Tuple[str, _StoreCompiler]] = {
+    "price": (
+        os.path.join("market_data", "price_data", "*.csv"),
+        _StoreCompiler(
+            functools.partial(price_store.get_price_store, in_memory=False),
+            price_store._store_dir_for,
+            price_store.STORE_VERSION,
+            price_store._price_stores,
+        ),
+    ),
+    "finnhub": (
+        os.path.join("finnhub_data", "*", "*.json"),
+        _StoreCompiler(
+            finnhub_utils.get_finnhub_store,
+            finnhub_utils._store_dir_for,
+            finnhub_utils.FINNHUB_STORE_VERSION,
+            finnhub_utils._open_stores,
+        ),
+    ),
+    "simfin": (
+        os.path.join(
+            "fundamental_data", "simfin_data_all", "*", "companies", "us", "*.csv"
+        ),
+        _StoreCompiler(
+            functools.partial(fundamentals_index.load_statement_table, in_memory=False),
+            fundamentals_index._store_dir_for,
+            fundamentals_index.FUNDAMENTALS_STORE_VERSION,
+            fundamentals_index._tables,
+        ),
+    ),
+    "reddit": (
+        os.path.join("reddit_data", "*", "*.jsonl"),
+        _StoreCompiler(
+            reddit_utils.get_reddit_index,
+            reddit_utils._store_dir_for,
+            reddit_utils.REDDIT_INDEX_VERSION,
+            reddit_utils._open_indexes,
+        ),
+    ),
+}
+
+
+def file_checksum(path: str, block_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _manifest_path() -> str:
+    return os.path.join(get_config()["data_cache_dir"], MANIFEST_NAME)
+
+
+def load_manifest() -> Dict:
+    try:
+        with open(_manifest_path()) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(manifest: Dict):
+    path = _manifest_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def discover_sources(data_dir: str) -> List[Tuple[str, str]]:
+    """``(kind, path)`` of every source file the compiler knows about."""
+    sources = []
+    for kind, (pattern, _) in COMPILERS.items():
+        for path in sorted(glob.glob(os.path.join(data_dir, pattern))):
+            sources.append((kind, path))
+    return sources
+
+
+def compile_data_dir(
+    data_dir: Annotated[str, "root data directory, e.g. config['data_dir']"],
+    force: Annotated[bool, "rebuild every layout regardless of the manifest"] = False,
+    verify: Annotated[
+        bool, "checksum unchanged-looking files too, to catch in-place edits"
+    ] = False,
+    progress: Optional[Callable[[str, str, str], None]] = None,
+) -> Dict[str, Dict[str, int]]:
+    """Compile every source under ``data_dir`` whose manifest entry is stale.
+
+    A source is up to date when its mtime and size match the manifest (and,
+    with ``verify``, its checksum too) and its store was built from them
+    with the current layout version. Stale sources are rebuilt through
+    the same store getters the query functions use. ``progress`` is called with
+    ``(kind, path, status)`` for each file, status being one of ``built``,
+    ``unchanged`` or ``failed``. Returns the number of files per kind and
+    status.
+    """
+    data_dir = os.path.abspath(data_dir)
+    manifest = load_manifest()
+    if "dirs" not in manifest:
+        manifest = {"dirs": {}}
+    entries = manifest["dirs"].setdefault(data_dir, {})
+
+    summary: Dict[str, Dict[str, int]] = {}
+    seen = set()
+    for kind, path in discover_sources(data_dir):
+        rel_path = os.path.relpath(path, data_dir)
+        seen.add(rel_path)
+        source_stat = os.stat(path)
+        entry = entries.get(rel_path)
+
+        compiler = COMPILERS[kind][1]
+        up_to_date = (
+            not force
+            and entry is not None
+            and entry["mtime_ns"] == source_stat.st_mtime_ns
+            and entry["size"] == source_stat.st_size
+            and compiler.is_current(path, source_stat)
+        )
+        checksum = None
+        rebuild = force
+        if up_to_date and verify:
+            checksum = file_checksum(path)
+            up_to_date = checksum == entry["sha256"]
+            rebuild = not up_to_date
+
+        if up_to_date:
+            status = "unchanged"
+        else:
+            status = "built"
+            try:
+                compiler.compile(path, rebuild)
+            except Exception as e:
+                print(f"Compile: failed on {path}: {e}")
+                status = "failed"
+            if status != "failed":
+                entries[rel_path] = {
+                    "kind": kind,
+                    "mtime_ns": source_stat.st_mtime_ns,
+                    "size": source_stat.st_size,
+                    "sha256": checksum or file_checksum(path),
+                    "compiled_at": datetime.now().isoformat(timespec="seconds"),
+                }
+
+        counts = summary.setdefault(kind, {})
+        counts[status] = counts.get(status, 0) + 1
+        if progress is not None:
+            progress(kind, path, status)
+
+    for rel_path in set(entries) - seen:
+        del entries[rel_path]
+    _save_manifest(manifest)
+    return summary
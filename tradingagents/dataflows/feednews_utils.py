@@ -0,0 +1,130 @@
+import asyncio
+import calendar
+from datetime import datetime, timedelta
+from typing import Annotated, Dict, List, Optional
+
+import feedparser
+import httpx
+from bs4 import BeautifulSoup
+
+from .config import get_config
+from .googlenews_utils import _run_with_client, make_request_async, news_client
+
+
+def _google_news_feed_url(query: str, start_date: str, end_date: str) -> str:
+    # ``before:`` is exclusive, so it points at the day after the window
+    before = datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1)
+    return (
+        f"{get_config()['google_news_rss_url']}?q={query}"
+        f"+after:{start_date}+before:{before.strftime('%Y-%m-%d')}"
+        f"&hl=en-US&gl=US&ceid=US:en"
+    )
+
+
+def _entry_date(entry) -> Optional[str]:
+    parsed = entry.get("published_parsed") or entry.get("updated_parsed")
+    if parsed is None:
+        return None
+    return datetime.utcfromtimestamp(calendar.timegm(parsed)).strftime("%Y-%m-%d")
+
+
+def _mentions(query: str, text: str) -> bool:
+    text = text.lower()
+    return all(term in text for term in query.lower().replace("+", " ").split())
+
+
+def parse_feed(
+    content: Annotated[bytes, "RSS or Atom document"],
+    default_source: Annotated[str, "source used when an entry names none"] = "",
+) -> List[Dict[str, str]]:
+    """Entries of a feed as ``{title, snippet, date, source, link}`` records,
+    the same fields ``getNewsData`` scrapes. ``date`` is yyyy-mm-dd, or
+    empty when the entry has none."""
+    feed = feedparser.parse(content)
+    feed_title = feed.feed.get("title", default_source)
+
+    news_results = []
+    for entry in feed.entries:
+        source = entry.get("source", {}).get("title") or feed_title
+        snippet = BeautifulSoup(entry.get("summary", ""), "html.parser").get_text(
+            " ", strip=True
+        )
+        news_results.append(
+            {
+                "link": entry.get("link", ""),
+                "title": entry.get("title", ""),
+                "snippet": snippet,
+                "date": _entry_date(entry) or "",
+                "source": source,
+            }
+        )
+    return news_results
+
+
+async def getFeedNewsDataAsync(
+    query: Annotated[str, "search query, words joined by spaces or '+'"],
+    start_date: Annotated[str, "yyyy-mm-dd"],
+    end_date: Annotated[str, "yyyy-mm-dd"],
+    client: Annotated[
+        Optional[httpx.AsyncClient], "client to share between queries"
+    ] = None,
+) -> List[Dict[str, str]]:
+    """
+    News about ``query`` from the Google News RSS search and the publisher
+    feeds of ``news_feed_urls``, fetched concurrently. Only the Google News
+    request goes through the shared Google News rate limiter.
+    Publisher feeds are not searchable, so their entries are kept when they
+    mention every word of the query. Entries dated outside the window are
+    dropped, duplicate links are kept once, and the result is newest first.
+    """
+    if client is None:
+        async with news_client() as client:
+            return await getFeedNewsDataAsync(query, start_date, end_date, client)
+
+    feeds = [(_google_news_feed_url(query, start_date, end_date), False)] + [
+        (url, True) for url in get_config()["news_feed_urls"]
+    ]
+    # only Google is rate limited and backed off; publishers are fetched
+    # straight away so they never hold up Google requests of the process
+    responses = await asyncio.gather(
+        *(
+            client.get(url) if is_publisher else make_request_async(client, url)
+            for url, is_publisher in feeds
+        ),
+        return_exceptions=True,
+    )
+
+    news_results = []
+    seen_links = set()
+    for (url, is_publisher), response in zip(feeds, responses):
+        if isinstance(response, BaseException) or response.status_code != 200:
+            failure = getattr(response, "status_code", response)
+            print(f"Failed to fetch feed {url}: {failure}")
+            continue
+        for news in parse_feed(response.content, httpx.URL(url).host):
+            if news["date"] and not start_date <= news["date"] <= end_date:
+                continue
+            if is_publisher and not _mentions(
+                query, f"{news['title']} {news['snippet']}"
+            ):
+                continue
+            if news["link"] in seen_links:
+                continue
+            seen_links.add(news["link"])
+            news_results.append(news)
+
+    # stable, so each feed's own order is kept within a day
+    news_results.sort(key=lambda news: news["date"], reverse=True)
+    return news_results
+
+
+def getFeedNewsData(query, start_date, end_date):
+    """
+    News about a query from RSS/Atom feeds for a date range.
+    query: str - search query
+    start_date: str - start date in the format yyyy-mm-dd
+    end_date: str - end date in the format yyyy-mm-dd
+    """
+    return _run_with_client(
+        lambda client: getFeedNewsDataAsync(query, start_date, end_date, client)
+    )
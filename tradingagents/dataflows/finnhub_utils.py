@@ -1,5 +1,253 @@
+import bisect
 import json
 import os
+from collections.abc import Mapping
+from typing import Annotated, Dict, Hashable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .config import get_config
+from .store_utils import (
+    StoreCache,
+    make_tmp_dir,
+    open_or_build,
+    store_name,
+    swap_in,
+    write_meta,
+)
+
+# layout version of the finnhub stores
+FINNHUB_STORE_VERSION = 2
+# data types whose records are reported once, however many dates repeat them
+DEDUP_DATA_TYPES = ("insider_senti", "insider_trans")
+
+
+def record_key(value) -> Hashable:
+    """Hashable form of a decoded JSON value; equal values get equal keys."""
+    if isinstance(value, dict):
+        return frozenset((k, record_key(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return tuple(record_key(v) for v in value)
+    return value
+
+
+class FinnhubRange(Mapping):
+    """Entries of a date range, decoded from JSON only when accessed."""
+
+    def __init__(
+        self,
+        keys: List[str],
+        blob: bytes,
+        spans: List[Tuple[int, int]],
+        record_ids: Optional[List[np.ndarray]] = None,
+    ):
+        self._keys = keys
+        self._spans = dict(zip(keys, spans))
+        self._blob = blob
+        self._decoded: Dict[str, list] = {}
+        self._record_ids = dict(zip(keys, record_ids)) if record_ids else None
+
+    def __getitem__(self, key: str) -> list:
+        value = self._decoded.get(key)
+        if value is None:
+            start, end = self._spans[key]
+            value = json.loads(self._blob[start:end])
+            self._decoded[key] = value
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def unique_records(self) -> Iterator[dict]:
+        """Every distinct record of the range once, at its first occurrence.
+
+        Stores of ``DEDUP_DATA_TYPES`` carry a record id assigned at ingest,
+        so this is a set lookup per record; otherwise records are keyed with
+        :func:`record_key` here.
+        """
+        seen = set()
+        for key in self._keys:
+            entries = self[key]
+            if self._record_ids is not None:
+                ids = self._record_ids[key].tolist()
+            else:
+                ids = [record_key(entry) for entry in entries]
+            for record_id, entry in zip(ids, entries):
+                if record_id not in seen:
+                    seen.add(record_id)
+                    yield entry
+
+
+class FinnhubStore:
+    """Date-indexed copy of a ``{ticker}_data_formatted.json`` file.
+
+    The non-empty entries are kept as one JSON document per date in a single
+    blob, with the dates sorted next to their byte offsets. A range query is
+    two bisects and one read of the blob slice, and entries are only decoded
+    when they are used. Records of ``DEDUP_DATA_TYPES`` are deduplicated
+    within a date and given file-wide ids when the store is built.
+    """
+
+    def __init__(
+        self,
+        store_dir: str,
+        dates: List[str],
+        positions: np.ndarray,
+        offsets: np.ndarray,
+        record_ids: Optional[np.ndarray] = None,
+        record_offsets: Optional[np.ndarray] = None,
+    ):
+        self.store_dir = store_dir
+        self.dates = dates
+        # position of each date in the source file, to keep its ordering
+        self.positions = positions
+        self.offsets = offsets
+        # ids of the records of date i are record_ids[record_offsets[i]:record_offsets[i + 1]]
+        self.record_ids = record_ids
+        self.record_offsets = record_offsets
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def range(
+        self,
+        start_date: Annotated[str, "first date (inclusive), YYYY-MM-DD"],
+        end_date: Annotated[str, "last date (inclusive), YYYY-MM-DD"],
+    ) -> FinnhubRange:
+        lo = bisect.bisect_left(self.dates, start_date)
+        hi = max(lo, bisect.bisect_right(self.dates, end_date))
+        if lo == hi:
+            return FinnhubRange([], b"", [])
+
+        base = int(self.offsets[lo])
+        with open(os.path.join(self.store_dir, "entries.bin"), "rb") as f:
+            f.seek(base)
+            blob = f.read(int(self.offsets[hi]) - base)
+
+        rows = sorted(range(lo, hi), key=lambda i: self.positions[i])
+        keys = [self.dates[i] for i in rows]
+        spans = [
+            (int(self.offsets[i]) - base, int(self.offsets[i + 1]) - base)
+            for i in rows
+        ]
+        record_ids = None
+        if self.record_ids is not None:
+            record_ids = [
+                self.record_ids[self.record_offsets[i] : self.record_offsets[i + 1]]
+                for i in rows
+            ]
+        return FinnhubRange(keys, blob, spans, record_ids)
+
+    @classmethod
+    def build(
+        cls,
+        data_path: str,
+        store_dir: str,
+        source_stat: os.stat_result,
+        dedup: Annotated[bool, "deduplicate records and assign record ids"] = False,
+    ):
+        """Convert the JSON file into a store in ``store_dir``, atomically."""
+        with open(data_path, "r") as f:
+            data = json.load(f)
+
+        ids: Dict[Hashable, int] = {}
+        items = []
+        for position, (key, value) in enumerate(data.items()):
+            if len(value) == 0:
+                continue
+            day_ids: Dict[int, dict] = {}
+            if dedup:
+                for entry in value:
+                    record_id = ids.setdefault(record_key(entry), len(ids))
+                    day_ids.setdefault(record_id, entry)
+                value = list(day_ids.values())
+            items.append((key, position, value, list(day_ids)))
+        items.sort(key=lambda item: item[0])
+
+        tmp_dir = make_tmp_dir(store_dir)
+        offsets = [0]
+        with open(os.path.join(tmp_dir, "entries.bin"), "wb") as f:
+            for _, _, value, _ in items:
+                encoded = json.dumps(value, separators=(",", ":")).encode()
+                f.write(encoded)
+                offsets.append(offsets[-1] + len(encoded))
+        np.save(os.path.join(tmp_dir, "offsets.npy"), np.array(offsets, np.int64))
+        np.save(
+            os.path.join(tmp_dir, "positions.npy"),
+            np.array([position for _, position, _, _ in items], np.int64),
+        )
+        if dedup:
+            counts = [len(day_ids) for *_, day_ids in items]
+            np.save(
+                os.path.join(tmp_dir, "record_ids.npy"),
+                np.array([i for *_, day_ids in items for i in day_ids], np.int64),
+            )
+            np.save(
+                os.path.join(tmp_dir, "record_offsets.npy"),
+                np.cumsum([0] + counts, dtype=np.int64),
+            )
+        write_meta(
+            tmp_dir,
+            data_path,
+            source_stat,
+            FINNHUB_STORE_VERSION,
+            dates=[key for key, _, _, _ in items],
+            record_ids=dedup,
+        )
+        swap_in(tmp_dir, store_dir)
+
+    @classmethod
+    def open(cls, store_dir: str) -> "FinnhubStore":
+        with open(os.path.join(store_dir, "meta.json")) as f:
+            meta = json.load(f)
+
+        def _load(name):
+            return np.load(os.path.join(store_dir, name))
+
+        record_ids = record_offsets = None
+        if meta["record_ids"]:
+            record_ids = _load("record_ids.npy")
+            record_offsets = _load("record_offsets.npy")
+        return cls(
+            store_dir,
+            meta["dates"],
+            _load("positions.npy"),
+            _load("offsets.npy"),
+            record_ids,
+            record_offsets,
+        )
+
+
+def _store_dir_for(data_path: str) -> str:
+    data_type = os.path.basename(os.path.dirname(os.path.abspath(data_path)))
+    store_root = os.path.join(get_config()["data_cache_dir"], "finnhub_store")
+    return os.path.join(store_root, data_type, store_name(data_path))
+
+
+_open_stores: StoreCache[FinnhubStore] = StoreCache()
+
+
+def get_finnhub_store(
+    data_path: Annotated[str, "path of a finnhub *_data_formatted.json file"],
+) -> FinnhubStore:
+    """Return the store of ``data_path``, building it on first use and
+    whenever the JSON file changes."""
+
+    def load(data_path: str, source_stat: os.stat_result) -> FinnhubStore:
+        data_type = os.path.basename(os.path.dirname(os.path.abspath(data_path)))
+        return open_or_build(
+            _store_dir_for(data_path),
+            data_path,
+            source_stat,
+            FINNHUB_STORE_VERSION,
+            lambda *args: FinnhubStore.build(*args, data_type in DEDUP_DATA_TYPES),
+            FinnhubStore.open,
+        )
+
+    return _open_stores.get(data_path, load)
 
 
 def get_data_in_range(ticker, start_date, end_date, data_type, data_dir, period=None):
@@ -11,6 +259,9 @@ def get_data_in_range(ticker, start_date, end_date, data_type, data_dir, period=
         data_type (str): Type of data from finnhub to fetch. Can be insider_trans, SEC_filings, news_data, insider_senti, or fin_as_reported.
         data_dir (str): Directory where the data is saved.
         period (str): Default to none, if there is a period specified, should be annual or quarterly.
+    Returns:
+        Mapping of date to the non-empty entries of that date, in file order.
+        Entries are decoded on access.
     """
 
     if period:
@@ -25,12 +276,5 @@ def get_data_in_range(ticker, start_date, end_date, data_type, data_dir, period=
             data_dir, "finnhub_data", data_type, f"{ticker}_data_formatted.json"
         )
 
-    data = open(data_path, "r")
-    data = json.load(data)
-
-    # filter keys (date, str in format YYYY-MM-DD) by the date range (str, str in format YYYY-MM-DD)
-    filtered_data = {}
-    for key, value in data.items():
-        if start_date <= key <= end_date and len(value) > 0:
-            filtered_data[key] = value
-    return filtered_data
+    # range query on the date-indexed store instead of loading the whole file
+    return get_finnhub_store(data_path).range(start_date, end_date)
@@ -0,0 +1,392 @@
+import json
+import os
+import threading
+from typing import Annotated, Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .config import get_config
+from .store_utils import (
+    StoreCache,
+    make_tmp_dir,
+    meta_is_current,
+    store_name,
+    swap_in,
+    write_meta,
+)
+
+# layout version of the SimFin stores
+FUNDAMENTALS_STORE_VERSION = 2
+
+# columns no report prints, never loaded
+SIMFIN_DROPPED_COLUMNS = ("SimFinId",)
+# low-cardinality text columns kept as categoricals
+SIMFIN_CATEGORICAL_COLUMNS = ("Ticker", "Currency", "Fiscal Period", "Restated Date")
+
+# statement -> (directory, file name pattern) below simfin_data_all
+SIMFIN_STATEMENTS = {
+    "balance_sheet": ("balance_sheet", "us-balance-{freq}.csv"),
+    "cashflow": ("cash_flow", "us-cashflow-{freq}.csv"),
+    "income": ("income_statements", "us-income-{freq}.csv"),
+}
+SIMFIN_FREQUENCIES = ("annual", "quarterly")
+
+
+def simfin_statement_path(
+    statement: Annotated[str, "balance_sheet, cashflow or income"],
+    freq: Annotated[str, "annual / quarterly"],
+    data_dir: Annotated[str, "root data directory"],
+) -> str:
+    directory, pattern = SIMFIN_STATEMENTS[statement]
+    return os.path.join(
+        data_dir,
+        "fundamental_data",
+        "simfin_data_all",
+        directory,
+        "companies",
+        "us",
+        pattern.format(freq=freq),
+    )
+
+
+def _compact_dtypes(data: pd.DataFrame) -> pd.DataFrame:
+    """Shrink columns without changing a value: categorical text columns,
+    float32/int32 wherever every value survives the round trip."""
+    for name in data.columns:
+        column = data[name]
+        if name in SIMFIN_CATEGORICAL_COLUMNS and column.dtype == object:
+            data[name] = column.astype("category")
+        elif column.dtype == np.float64:
+            values = column.to_numpy()
+            with np.errstate(over="ignore"):
+                narrow = values.astype(np.float32)
+            if np.array_equal(narrow.astype(np.float64), values, equal_nan=True):
+                data[name] = narrow
+        elif column.dtype == np.int64:
+            info = np.iinfo(np.int32)
+            if column.empty or info.min <= column.min() and column.max() <= info.max:
+                data[name] = column.astype(np.int32)
+    return data
+
+
+def _widen(value):
+    # float32 cells print differently from the float64 they came from
+    return float(value) if isinstance(value, np.float32) else value
+
+
+class StatementTable:
+    """One SimFin statement file, parsed once and grouped by ticker.
+
+    Rows are sorted by ticker and then by Publish Date (stable, so rows
+    published on the same day keep their file order), and every ticker maps
+    to its slice of rows. "Latest statement published on or before D" is a
+    bisect inside that slice. Columns no report prints are not loaded, and
+    the rest are stored in the narrowest dtype that keeps every value.
+    """
+
+    def __init__(
+        self,
+        data: pd.DataFrame,
+        prepared: Annotated[bool, "dates already parsed and rows sorted"] = False,
+    ):
+        if not prepared:
+            # dates are parsed once here instead of on every lookup
+            for column in ("Report Date", "Publish Date"):
+                data[column] = pd.to_datetime(data[column], utc=True).dt.normalize()
+            data = data.sort_values(["Ticker", "Publish Date"], kind="stable")
+            data = _compact_dtypes(data)
+
+        self.data = data
+        self.publish_dates = self.data["Publish Date"].to_numpy(dtype="datetime64[ns]")
+
+        self.ticker_rows: Dict[str, Tuple[int, int]] = {}
+        tickers = self.data["Ticker"].to_numpy(dtype=object)
+        if len(tickers):
+            starts = np.flatnonzero(np.r_[True, tickers[1:] != tickers[:-1]])
+            ends = np.r_[starts[1:], len(tickers)]
+            for lo, hi in zip(starts, ends):
+                self.ticker_rows[tickers[lo]] = (int(lo), int(hi))
+        self._asof_keys: Optional[pd.DataFrame] = None
+
+    @classmethod
+    def read(cls, path: str) -> "StatementTable":
+        return cls(
+            pd.read_csv(
+                path, sep=";", usecols=lambda c: c not in SIMFIN_DROPPED_COLUMNS
+            )
+        )
+
+    def memory_usage(self) -> int:
+        """Resident bytes of the table, strings included."""
+        return int(
+            self.data.memory_usage(deep=True).sum()
+            + self.publish_dates.nbytes
+        )
+
+    def save(
+        self, store_dir: str, source_path: str, source_stat: os.stat_result
+    ) -> bool:
+        """Write the parsed, sorted table as one ``.npy`` file per column.
+
+        Returns False without writing anything for columns that have no
+        lossless binary form here (object columns holding non-strings).
+        """
+        layout = []
+        arrays = []
+        for name in self.data.columns:
+            column = self.data[name]
+            mask = None
+            categories = None
+            if isinstance(column.dtype, pd.DatetimeTZDtype):
+                kind = "datetime_utc"
+                values = column.dt.tz_convert("UTC").dt.tz_localize(None).to_numpy()
+            elif isinstance(column.dtype, pd.CategoricalDtype):
+                categories = column.cat.categories
+                if not all(isinstance(value, str) for value in categories):
+                    return False
+                kind = "category"
+                values = column.cat.codes.to_numpy()
+            elif column.dtype.kind in "biuf":
+                kind = "numeric"
+                values = column.to_numpy()
+            elif column.dtype == object:
+                mask = column.isna().to_numpy()
+                if not column[~mask].map(type).eq(str).all():
+                    return False
+                kind = "text"
+                values = column.where(~mask, "").to_numpy().astype(str)
+            else:
+                return False
+            layout.append({"name": str(name), "kind": kind})
+            if categories is not None:
+                layout[-1]["categories"] = list(categories)
+            arrays.append((values, mask))
+
+        tmp_dir = make_tmp_dir(store_dir)
+        for i, (values, mask) in enumerate(arrays):
+            np.save(os.path.join(tmp_dir, f"col{i}.npy"), values)
+            if mask is not None:
+                np.save(os.path.join(tmp_dir, f"mask{i}.npy"), mask)
+        np.save(os.path.join(tmp_dir, "index.npy"), self.data.index.to_numpy())
+        write_meta(
+            tmp_dir,
+            source_path,
+            source_stat,
+            FUNDAMENTALS_STORE_VERSION,
+            columns=layout,
+        )
+        swap_in(tmp_dir, store_dir)
+        return True
+
+    @classmethod
+    def open(cls, store_dir: str) -> "StatementTable":
+        """Load a table written by :meth:`save`, with no CSV or date parsing."""
+        with open(os.path.join(store_dir, "meta.json")) as f:
+            meta = json.load(f)
+
+        def _load(name):
+            return np.load(os.path.join(store_dir, name), mmap_mode="r")
+
+        data = {}
+        for i, column in enumerate(meta["columns"]):
+            values = _load(f"col{i}.npy")
+            if column["kind"] == "datetime_utc":
+                values = pd.DatetimeIndex(values).tz_localize("UTC")
+            elif column["kind"] == "category":
+                values = pd.Categorical.from_codes(
+                    np.asarray(values), categories=column["categories"]
+                )
+            elif column["kind"] == "text":
+                values = values.astype(object)
+                values[_load(f"mask{i}.npy")] = np.nan
+            data[column["name"]] = values
+        index = pd.Index(np.asarray(_load("index.npy")))
+        return cls(pd.DataFrame(data, index=index), prepared=True)
+
+    def as_of_row(
+        self,
+        ticker: Annotated[str, "ticker symbol"],
+        curr_date: Annotated[str, "yyyy-mm-dd"],
+    ) -> Optional[int]:
+        """Position in ``data`` of the latest statement published on or
+        before ``curr_date``; the first such row if several share that day."""
+        rows = self.ticker_rows.get(ticker)
+        if rows is None:
+            return None
+        lo, hi = rows
+        day = pd.to_datetime(curr_date, utc=True).normalize().to_datetime64()
+        dates = self.publish_dates[lo:hi]
+        end = int(np.searchsorted(dates, day, side="right"))
+        if end == 0:
+            return None
+        return lo + int(np.searchsorted(dates, dates[end - 1], side="left"))
+
+    def as_of(
+        self,
+        ticker: Annotated[str, "ticker symbol"],
+        curr_date: Annotated[str, "yyyy-mm-dd"],
+    ) -> Optional[pd.Series]:
+        row = self.as_of_row(ticker, curr_date)
+        return None if row is None else self.data.iloc[row].map(_widen)
+
+    def as_of_batch(
+        self,
+        tickers: Annotated[Sequence[str], "ticker of every request"],
+        dates: Annotated[Sequence, "as-of date of every request"],
+    ) -> pd.DataFrame:
+        """Vectorized :meth:`as_of`: row ``i`` holds the latest statement of
+        ``tickers[i]`` published on or before ``dates[i]``, all-NaN if there is
+        none. One ``merge_asof`` over the publish dates answers every pair."""
+        if self._asof_keys is None:
+            # one candidate row per (ticker, publish day), the first in file order
+            keys = pd.DataFrame(
+                {
+                    "Ticker": self.data["Ticker"].to_numpy(),
+                    "Publish Date": self.data["Publish Date"].to_numpy(),
+                    "row": np.arange(len(self.data)),
+                }
+            )
+            keys = keys.dropna(subset=["Publish Date"])
+            keys = keys.drop_duplicates(["Ticker", "Publish Date"], keep="first")
+            self._asof_keys = keys.sort_values("Publish Date", kind="stable")
+
+        requests = pd.DataFrame(
+            {
+                "Ticker": np.asarray(tickers, dtype=object),
+                "As Of": pd.to_datetime(pd.Series(dates), utc=True).dt.normalize(),
+                "request": np.arange(len(tickers)),
+            }
+        )
+        merged = pd.merge_asof(
+            requests.sort_values("As Of", kind="stable"),
+            self._asof_keys,
+            left_on="As Of",
+            right_on="Publish Date",
+            by="Ticker",
+            direction="backward",
+        )
+        found = merged.dropna(subset=["row"])
+
+        result = self.data.iloc[found["row"].to_numpy(dtype=np.int64)]
+        result.index = found["request"].to_numpy()
+        return result.reindex(np.arange(len(requests)))
+
+
+def _store_dir_for(path: str) -> str:
+    store_root = os.path.join(get_config()["data_cache_dir"], "simfin_store")
+    return os.path.join(store_root, store_name(path))
+
+
+def load_statement_table(
+    path: Annotated[str, "path of a SimFin statement CSV"],
+    in_memory: Annotated[
+        bool, "return the parsed CSV when the store cannot be written"
+    ] = True,
+) -> Optional[StatementTable]:
+    """Table of a SimFin CSV, read from its compiled store when that is
+    current and compiled otherwise. If the store cannot be written, the
+    parsed CSV is returned, or None when ``in_memory`` is False."""
+    source_stat = os.stat(path)  # raises FileNotFoundError like read_csv
+    store_dir = _store_dir_for(path)
+    if meta_is_current(store_dir, path, source_stat, FUNDAMENTALS_STORE_VERSION):
+        return StatementTable.open(store_dir)
+
+    table = StatementTable.read(path)
+    try:
+        os.makedirs(os.path.dirname(store_dir), exist_ok=True)
+        persisted = table.save(store_dir, path, source_stat)
+        if not persisted:
+            print(f"Fundamentals store: {path} has columns with no stored layout")
+    except OSError as e:
+        print(f"Fundamentals store: could not persist {store_dir}: {e}")
+        persisted = False
+    return table if persisted or in_memory else None
+
+
+# tables loaded in this process, shared by the indexes of every data dir
+_tables: StoreCache[StatementTable] = StoreCache()
+
+
+class FundamentalsIndex:
+    """Point-in-time index over the SimFin statements of a data directory.
+
+    Each (statement, frequency) file is loaded the first time it is needed
+    and then shared by every caller in the process; a file is reloaded if
+    its size or mtime changes. Lookups never re-read the CSV, and the
+    SimFinId column is never loaded. Files load under a lock of their own,
+    so a cold balance sheet, cash flow and income lookup proceed in parallel.
+    """
+
+    def __init__(self, data_dir: str):
+        self.data_dir = data_dir
+
+    def table(
+        self,
+        statement: Annotated[str, "balance_sheet, cashflow or income"],
+        freq: Annotated[str, "annual / quarterly"],
+    ) -> StatementTable:
+        path = simfin_statement_path(statement, freq, self.data_dir)
+        return _tables.get(path, lambda path, _: load_statement_table(path))
+
+    def as_of(
+        self,
+        statement: Annotated[str, "balance_sheet, cashflow or income"],
+        freq: Annotated[str, "annual / quarterly"],
+        ticker: Annotated[str, "ticker symbol"],
+        curr_date: Annotated[str, "yyyy-mm-dd"],
+    ) -> Optional[pd.Series]:
+        """Latest statement of ``ticker`` published on or before ``curr_date``."""
+        return self.table(statement, freq).as_of(ticker, curr_date)
+
+    def memory_usage(self) -> Dict[str, int]:
+        """Resident bytes of every loaded table, keyed ``statement/freq``."""
+        usage = {}
+        for statement in SIMFIN_STATEMENTS:
+            for freq in SIMFIN_FREQUENCIES:
+                path = simfin_statement_path(statement, freq, self.data_dir)
+                table = _tables.peek(path)
+                if table is not None:
+                    usage[f"{statement}/{freq}"] = table.memory_usage()
+        usage["total"] = sum(usage.values())
+        return usage
+
+    def as_of_batch(
+        self,
+        pairs: Annotated[Iterable[Tuple[str, str]], "(ticker, yyyy-mm-dd) requests"],
+        freq: Annotated[str, "annual / quarterly"],
+        statements: Sequence[str] = tuple(SIMFIN_STATEMENTS),
+    ) -> pd.DataFrame:
+        """Point-in-time statements for many (ticker, date) pairs at once.
+
+        Returns one row per pair, indexed by (Ticker, Date) in request
+        order, with ``(statement, field)`` columns. The ticker, repeated in
+        every statement, is dropped.
+        """
+        pairs = list(pairs)
+        tickers = [ticker for ticker, _ in pairs]
+        dates = [date for _, date in pairs]
+
+        frames = {}
+        for statement in statements:
+            frame = self.table(statement, freq).as_of_batch(tickers, dates)
+            frames[statement] = frame.drop(columns=["Ticker"])
+        result = pd.concat(frames, axis=1)
+        result.index = pd.MultiIndex.from_arrays(
+            [tickers, dates], names=["Ticker", "Date"]
+        )
+        return result
+
+
+_indexes: Dict[str, FundamentalsIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_fundamentals_index(
+    data_dir: Annotated[str, "root data directory"],
+) -> FundamentalsIndex:
+    with _indexes_lock:
+        index = _indexes.get(data_dir)
+        if index is None:
+            index = _indexes[data_dir] = FundamentalsIndex(data_dir)
+        return index
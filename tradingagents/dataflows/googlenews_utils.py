@@ -1,16 +1,24 @@
+import asyncio
 import json
-import requests
+import os
+import threading
+import httpx
 from bs4 import BeautifulSoup
-from datetime import datetime
+from datetime import datetime, timedelta
 import time
-import random
-from tenacity import (
-    retry,
-    stop_after_attempt,
-    wait_exponential,
-    retry_if_exception_type,
-    retry_if_result,
-)
+from typing import Annotated, Awaitable, Callable, Dict, List, Optional, Tuple
+from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_result
+
+from . import news_cache
+from .config import get_config
+
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/101.0.4951.54 Safari/537.36"
+    )
+}
 
 
 def is_rate_limited(response):
@@ -18,17 +26,258 @@ def is_rate_limited(response):
     return response.status_code == 429
 
 
+class TokenBucket:
+    """Rate limiter shared by every thread and event loop of the process.
+
+    Each request takes one token; tokens refill at ``rate`` per second up to
+    ``capacity``. A caller that finds the bucket empty reserves the next
+    token anyway and is told how long to wait for it, so waiting callers
+    are served in arrival order without holding the lock while they sleep.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self._lock = threading.Lock()
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    def configure(self, rate: float, capacity: float):
+        with self._lock:
+            self.rate = rate
+            self.capacity = capacity
+            self._tokens = min(self._tokens, capacity)
+
+    def reserve(self) -> float:
+        """Take a token and return the seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    async def acquire(self):
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+_rate_limiter: Optional[TokenBucket] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> TokenBucket:
+    """The process-wide Google News rate limiter, following the
+    ``google_news_requests_per_second`` and ``google_news_burst`` config."""
+    global _rate_limiter
+    config = get_config()
+    rate = config["google_news_requests_per_second"]
+    capacity = config["google_news_burst"]
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = TokenBucket(rate, capacity)
+        elif (_rate_limiter.rate, _rate_limiter.capacity) != (rate, capacity):
+            _rate_limiter.configure(rate, capacity)
+        return _rate_limiter
+
+
+def _to_search_date(date: str) -> str:
+    if "-" in date:
+        date = datetime.strptime(date, "%Y-%m-%d")
+        date = date.strftime("%m/%d/%Y")
+    return date
+
+
+def parse_news_page(content) -> Tuple[List[Dict[str, str]], bool]:
+    """Results of a Google News search page, and whether it has a next page."""
+    soup = BeautifulSoup(content, "html.parser")
+    results_on_page = soup.select("div.SoaBEf")
+
+    news_results = []
+    for el in results_on_page:
+        try:
+            link = el.find("a")["href"]
+            title = el.select_one("div.MBeuO").get_text()
+            snippet = el.select_one(".GI74Re").get_text()
+            date = el.select_one(".LfVVr").get_text()
+            source = el.select_one(".NUnG9d span").get_text()
+            news_results.append(
+                {
+                    "link": link,
+                    "title": title,
+                    "snippet": snippet,
+                    "date": date,
+                    "source": source,
+                }
+            )
+        except Exception as e:
+            print(f"Error processing result: {e}")
+            # If one of the fields is not found, skip this result
+            continue
+
+    has_next = bool(results_on_page) and soup.find("a", id="pnnext") is not None
+    return news_results, has_next
+
+
 @retry(
     retry=(retry_if_result(is_rate_limited)),
     wait=wait_exponential(multiplier=1, min=4, max=60),
     stop=stop_after_attempt(5),
 )
-def make_request(url, headers):
-    """Make a request with retry logic for rate limiting"""
-    # Random delay before each request to avoid detection
-    time.sleep(random.uniform(2, 6))
-    response = requests.get(url, headers=headers)
-    return response
+async def make_request_async(client: httpx.AsyncClient, url: str) -> httpx.Response:
+    """Rate-limited GET, retried with exponential backoff on HTTP 429"""
+    await get_rate_limiter().acquire()
+    return await client.get(url)
+
+
+def _page_url(query: str, start_date: str, end_date: str, page: int) -> str:
+    return (
+        f"{get_config()['google_news_base_url']}?q={query}"
+        f"&tbs=cdr:1,cd_min:{start_date},cd_max:{end_date}"
+        f"&tbm=nws&start={page * 10}"
+    )
+
+
+def news_client() -> httpx.AsyncClient:
+    """HTTP client whose connections are reused across the requests made
+    through it; the sync entry points share one, see ``_run_with_client``."""
+    return httpx.AsyncClient(headers=HEADERS, follow_redirects=True, timeout=30)
+
+
+async def _fetch_news(
+    query: str, start_date: str, end_date: str, client: httpx.AsyncClient
+) -> Tuple[List[Dict[str, str]], bool]:
+    """Results of all pages, and whether the last page was reached with
+    every page answered successfully."""
+    concurrency = max(1, get_config()["google_news_page_concurrency"])
+
+    async def fetch_page(page: int):
+        response = await make_request_async(
+            client, _page_url(query, start_date, end_date, page)
+        )
+        # an error or block page would otherwise parse as an empty last page
+        response.raise_for_status()
+        return parse_news_page(response.content)
+
+    news_results = []
+    # most searches fit on one page, so the first is fetched alone and the
+    # following ones only once it links to a next page
+    batch = [fetch_page(0)]
+    page = 1
+    while True:
+        for result in await asyncio.gather(*batch, return_exceptions=True):
+            if isinstance(result, BaseException):
+                print(f"Failed to fetch news page: {result}")
+                return news_results, False
+            results_on_page, has_next = result
+            news_results.extend(results_on_page)
+            if not has_next:
+                return news_results, True
+        batch = [fetch_page(page + i) for i in range(concurrency)]
+        page += concurrency
+
+
+async def getNewsDataAsync(
+    query: Annotated[str, "search query"],
+    start_date: Annotated[str, "yyyy-mm-dd or mm/dd/yyyy"],
+    end_date: Annotated[str, "yyyy-mm-dd or mm/dd/yyyy"],
+    client: Annotated[
+        Optional[httpx.AsyncClient], "client to share between queries"
+    ] = None,
+) -> List[Dict[str, str]]:
+    """
+    Scrape Google News search results for a given query and date range.
+    The first result page is requested alone; once it links to a next page,
+    up to ``google_news_page_concurrency`` pages are requested at a time,
+    ahead of knowing whether the earlier ones have a next page, and pages
+    past the last one are discarded. Every request goes through the
+    process-wide rate limiter.
+    """
+    if client is None:
+        async with news_client() as client:
+            return await getNewsDataAsync(query, start_date, end_date, client)
+
+    news_results, _ = await _fetch_news(
+        query, _to_search_date(start_date), _to_search_date(end_date), client
+    )
+    return news_results
+
+
+async def getNewsDataByDayAsync(
+    query: Annotated[str, "search query"],
+    start_date: Annotated[str, "first day, yyyy-mm-dd"],
+    end_date: Annotated[str, "last day, yyyy-mm-dd"],
+    client: Annotated[
+        Optional[httpx.AsyncClient], "client to share between queries"
+    ] = None,
+) -> List[Dict[str, str]]:
+    """
+    Google News results of every day of the window, most recent day first,
+    served from the per-day cache where possible. Only the days missing
+    from the cache are scraped, each as its own one-day search, and they
+    are cached only once all of their pages were read successfully.
+    """
+    first = datetime.strptime(start_date, "%Y-%m-%d")
+    last = datetime.strptime(end_date, "%Y-%m-%d")
+    days = [
+        (last - timedelta(days=i)).strftime("%Y-%m-%d")
+        for i in range((last - first).days + 1)
+    ]
+
+    results_by_day = {day: news_cache.load_day(query, day) for day in days}
+    missing = [day for day in days if results_by_day[day] is None]
+
+    async def fetch_days(client: httpx.AsyncClient):
+        return await asyncio.gather(
+            *(
+                _fetch_news(query, _to_search_date(day), _to_search_date(day), client)
+                for day in missing
+            )
+        )
+
+    if missing:
+        if client is None:
+            async with news_client() as own_client:
+                fetched = await fetch_days(own_client)
+        else:
+            fetched = await fetch_days(client)
+        for day, (day_results, complete) in zip(missing, fetched):
+            if complete:
+                news_cache.save_day(query, day, day_results)
+            results_by_day[day] = day_results
+
+    return [news for day in days for news in results_by_day[day]]
+
+
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+_client_loop_pid = 0
+_shared_client: Optional[httpx.AsyncClient] = None
+_client_loop_lock = threading.Lock()
+
+
+def _run_with_client(make_coro: Callable[[httpx.AsyncClient], Awaitable]):
+    """Run ``make_coro(client)`` to completion from synchronous code.
+
+    An AsyncClient is bound to the event loop it is used on, so the process
+    keeps one loop in a background thread and one client on it. Every sync
+    call runs there and reuses the client's pooled connections, also when
+    the calling thread already runs an event loop of its own.
+    """
+    global _client_loop, _client_loop_pid, _shared_client
+    with _client_loop_lock:
+        # a forked child does not inherit the loop's thread
+        if _client_loop is None or _client_loop_pid != os.getpid():
+            _client_loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_client_loop.run_forever, name="news-client", daemon=True
+            ).start()
+            _client_loop_pid = os.getpid()
+            _shared_client = news_client()
+        loop, client = _client_loop, _shared_client
+    return asyncio.run_coroutine_threadsafe(make_coro(client), loop).result()
 
 
 def getNewsData(query, start_date, end_date):
@@ -38,71 +287,16 @@ def getNewsData(query, start_date, end_date):
     start_date: str - start date in the format yyyy-mm-dd or mm/dd/yyyy
     end_date: str - end date in the format yyyy-mm-dd or mm/dd/yyyy
     """
-    if "-" in start_date:
-        start_date = datetime.strptime(start_date, "%Y-%m-%d")
-        start_date = start_date.strftime("%m/%d/%Y")
-    if "-" in end_date:
-        end_date = datetime.strptime(end_date, "%Y-%m-%d")
-        end_date = end_date.strftime("%m/%d/%Y")
-
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/101.0.4951.54 Safari/537.36"
-        )
-    }
+    return _run_with_client(
+        lambda client: getNewsDataAsync(query, start_date, end_date, client)
+    )
 
-    news_results = []
-    page = 0
-    while True:
-        offset = page * 10
-        url = (
-            f"https://www.google.com/search?q={query}"
-            f"&tbs=cdr:1,cd_min:{start_date},cd_max:{end_date}"
-            f"&tbm=nws&start={offset}"
-        )
-
-        try:
-            response = make_request(url, headers)
-            soup = BeautifulSoup(response.content, "html.parser")
-            results_on_page = soup.select("div.SoaBEf")
-
-            if not results_on_page:
-                break  # No more results found
-
-            for el in results_on_page:
-                try:
-                    link = el.find("a")["href"]
-                    title = el.select_one("div.MBeuO").get_text()
-                    snippet = el.select_one(".GI74Re").get_text()
-                    date = el.select_one(".LfVVr").get_text()
-                    source = el.select_one(".NUnG9d span").get_text()
-                    news_results.append(
-                        {
-                            "link": link,
-                            "title": title,
-                            "snippet": snippet,
-                            "date": date,
-                            "source": source,
-                        }
-                    )
-                except Exception as e:
-                    print(f"Error processing result: {e}")
-                    # If one of the fields is not found, skip this result
-                    continue
-
-            # Update the progress bar with the current count of results scraped
-
-            # Check for the "Next" link (pagination)
-            next_link = soup.find("a", id="pnnext")
-            if not next_link:
-                break
-
-            page += 1
-
-        except Exception as e:
-            print(f"Failed after multiple retries: {e}")
-            break
 
-    return news_results
+def getNewsDataByDay(query, start_date, end_date):
+    """
+    Google News results of every day from start_date to end_date (yyyy-mm-dd),
+    scraping only the days not in the per-day cache.
+    """
+    return _run_with_client(
+        lambda client: getNewsDataByDayAsync(query, start_date, end_date, client)
+    )
@@ -0,0 +1,100 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+
+from .config import get_config
+
+
+class IndicatorCache:
+    """Process-wide LRU cache of computed indicator columns.
+
+    Entries are tuples of NumPy arrays and are accounted by their ``nbytes``;
+    the least recently used entries are evicted once ``max_bytes`` is exceeded.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[Tuple[np.ndarray, ...], int]]" = (
+            OrderedDict()
+        )
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Tuple[np.ndarray, ...]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, arrays: Tuple[np.ndarray, ...]):
+        size = sum(a.nbytes for a in arrays)
+        for a in arrays:
+            a.flags.writeable = False  # cached arrays are shared between callers
+
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (arrays, size)
+            self._bytes += size
+            self._evict()
+
+    def resize(self, max_bytes: int):
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and self._entries:
+            _, (_, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+_cache: Optional[IndicatorCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_indicator_cache() -> IndicatorCache:
+    """Return the shared cache, sized from ``indicator_cache_max_bytes``."""
+    global _cache
+    max_bytes = get_config()["indicator_cache_max_bytes"]
+    with _cache_lock:
+        if _cache is None:
+            _cache = IndicatorCache(max_bytes)
+    if _cache.max_bytes != max_bytes:
+        _cache.resize(max_bytes)
+    return _cache
+
+
+def get_indicator_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters and memory usage of the shared indicator cache."""
+    return get_indicator_cache().stats()
@@ -0,0 +1,286 @@
+"""Vectorized NumPy implementation of the market analyst's indicator set.
+
+Every function works on arrays shaped ``(dates, symbols)`` (1-D series are
+accepted too), so a whole universe is computed in one pass. The formulas
+follow stockstats (``min_periods=1`` rolling windows, ``adjust=True``
+exponential averages, Wilder smoothing for RSI/ATR) and match its output
+to floating point tolerance. NaN rows ahead of a symbol's first bar are
+treated as "not listed yet" rather than as data.
+"""
+
+import re
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+SUPPORTED_INDICATORS = (
+    "close_50_sma",
+    "close_200_sma",
+    "close_10_ema",
+    "macd",
+    "macds",
+    "macdh",
+    "rsi",
+    "boll",
+    "boll_ub",
+    "boll_lb",
+    "atr",
+    "vwma",
+    "mfi",
+)
+
+_MA_PATTERN = re.compile(r"^close_(\d+)_(sma|ema)$")
+
+MACD_WINDOWS = (12, 26, 9)
+RSI_WINDOW = 14
+BOLL_WINDOW = 20
+BOLL_STD_TIMES = 2
+ATR_WINDOW = 14
+VWMA_WINDOW = 14
+MFI_WINDOW = 14
+
+
+def is_supported(indicator: str) -> bool:
+    return indicator in SUPPORTED_INDICATORS or bool(_MA_PATTERN.match(indicator))
+
+
+def _as_2d(arr) -> np.ndarray:
+    arr = np.asarray(arr, dtype=np.float64)
+    return arr.reshape(-1, 1) if arr.ndim == 1 else arr
+
+
+def _first_valid(x: np.ndarray) -> np.ndarray:
+    """Row of the first non-NaN value in each column (len(x) if none)."""
+    valid = ~np.isnan(x)
+    return np.where(valid.any(axis=0), valid.argmax(axis=0), len(x))
+
+
+def _listed(x: np.ndarray) -> np.ndarray:
+    """Mask of the rows at or after each column's first bar."""
+    rows = np.arange(len(x)).reshape(-1, 1)
+    return rows >= _first_valid(x)
+
+
+def _rolling_sum(x: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Rolling sum and count of the non-NaN values over ``window`` rows."""
+    valid = ~np.isnan(x)
+    csum = np.cumsum(np.where(valid, x, 0.0), axis=0)
+    ccount = np.cumsum(valid, axis=0)
+    total = csum.copy()
+    count = ccount.copy()
+    total[window:] -= csum[:-window]
+    count[window:] -= ccount[:-window]
+    return total, count
+
+
+def rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    total, count = _rolling_sum(x, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(count > 0, total / count, np.nan)
+
+
+def rolling_std(x: np.ndarray, window: int) -> np.ndarray:
+    """Sample (ddof=1) rolling standard deviation, computed in two passes."""
+    mean = rolling_mean(x, window)
+    _, count = _rolling_sum(x, window)
+    sq = np.zeros_like(x)
+    for k in range(window):
+        lagged = np.full_like(x, np.nan)
+        lagged[k:] = x[: len(x) - k]
+        dev = (lagged - mean) ** 2
+        sq += np.where(np.isnan(dev), 0.0, dev)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(count > 1, np.sqrt(sq / (count - 1)), np.nan)
+
+
+def ewm_mean(x: np.ndarray, alpha: float) -> np.ndarray:
+    """``adjust=True``, ``ignore_na=False`` exponentially weighted mean."""
+    decay = 1.0 - alpha
+    out = np.empty_like(x)
+    num = np.zeros(x.shape[1])
+    den = np.zeros(x.shape[1])
+    for t in range(len(x)):
+        row = x[t]
+        valid = ~np.isnan(row)
+        num *= decay
+        den *= decay
+        num[valid] += row[valid]
+        den[valid] += 1.0
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out[t] = np.where(den > 0, num / den, np.nan)
+    return out
+
+
+def ema(x: np.ndarray, span: int) -> np.ndarray:
+    return ewm_mean(x, 2.0 / (span + 1.0))
+
+
+def smma(x: np.ndarray, window: int) -> np.ndarray:
+    return ewm_mean(x, 1.0 / window)
+
+
+def _prev(x: np.ndarray) -> np.ndarray:
+    """Previous row, with each column's first bar standing in for itself."""
+    prev = np.empty_like(x)
+    prev[0] = x[0]
+    prev[1:] = x[:-1]
+    return np.where(np.isnan(prev), x, prev)
+
+
+def _typical_price(high, low, close) -> np.ndarray:
+    return (close + high + low) / 3.0
+
+
+def macd(close: np.ndarray) -> Dict[str, np.ndarray]:
+    short_w, long_w, signal_w = MACD_WINDOWS
+    line = ema(close, short_w) - ema(close, long_w)
+    signal = ema(line, signal_w)
+    return {"macd": line, "macds": signal, "macdh": line - signal}
+
+
+def rsi(close: np.ndarray, window: int = RSI_WINDOW) -> np.ndarray:
+    diff = close - _prev(close)
+    up = np.where(diff > 0, diff, 0.0)
+    down = np.where(diff < 0, -diff, 0.0)
+    listed = _listed(close)
+    up = np.where(listed, up, np.nan)
+    down = np.where(listed, down, np.nan)
+
+    up_smma = smma(up, window)
+    down_smma = smma(down, window)
+    total = up_smma + down_smma
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out = np.where(total != 0, 100 * (up_smma / total), 50.0)
+
+    first = _first_valid(close)
+    cols = np.flatnonzero(first < len(close))
+    out[first[cols], cols] = 50.0
+    return out
+
+
+def boll(close: np.ndarray, window: int = BOLL_WINDOW) -> Dict[str, np.ndarray]:
+    middle = rolling_mean(close, window)
+    width = BOLL_STD_TIMES * rolling_std(close, window)
+    return {"boll": middle, "boll_ub": middle + width, "boll_lb": middle - width}
+
+
+def atr(high, low, close, window: int = ATR_WINDOW) -> np.ndarray:
+    prev_close = _prev(close)
+    tr = np.maximum(
+        high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close))
+    )
+    tr = np.where(_listed(close), np.nan_to_num(tr), np.nan)
+    return smma(tr, window)
+
+
+def vwma(high, low, close, volume, window: int = VWMA_WINDOW) -> np.ndarray:
+    tpv_sum, _ = _rolling_sum(volume * _typical_price(high, low, close), window)
+    vol_sum, count = _rolling_sum(volume, window)
+    out = np.divide(
+        tpv_sum, vol_sum, out=np.zeros_like(tpv_sum), where=vol_sum != 0
+    )
+    return np.where(count > 0, out, np.nan)
+
+
+def mfi(high, low, close, volume, window: int = MFI_WINDOW) -> np.ndarray:
+    tp = _typical_price(high, low, close)
+    money_flow = tp * volume
+    tp_diff = tp - _prev(tp)
+
+    pos_sum, _ = _rolling_sum(np.where(tp_diff > 0, money_flow, 0.0), window)
+    neg_sum, _ = _rolling_sum(np.where(tp_diff < 0, money_flow, 0.0), window)
+    total = pos_sum + neg_sum
+    out = np.divide(pos_sum, total, out=np.full_like(pos_sum, 0.5), where=total > 0)
+
+    # stockstats pins the first ``window`` bars of each series to 0.5
+    first = _first_valid(close)
+    rows = np.arange(len(close)).reshape(-1, 1)
+    out = np.where(rows < first + window, 0.5, out)
+    return np.where(rows >= first, out, np.nan)
+
+
+def compute_indicators(
+    indicators: Iterable[str],
+    close,
+    high=None,
+    low=None,
+    volume=None,
+) -> Dict[str, np.ndarray]:
+    """Compute several indicators over ``(dates, symbols)`` price arrays.
+
+    Families that share intermediates (MACD, Bollinger) are computed once no
+    matter how many of their columns are requested. Results keep the shape
+    of ``close``.
+    """
+    squeeze = np.ndim(close) == 1
+    close = _as_2d(close)
+    high = _as_2d(high) if high is not None else None
+    low = _as_2d(low) if low is not None else None
+    volume = _as_2d(volume) if volume is not None else None
+
+    results: Dict[str, np.ndarray] = {}
+    for name in indicators:
+        if name in results:
+            continue
+        ma = _MA_PATTERN.match(name)
+        if ma:
+            window = int(ma.group(1))
+            if ma.group(2) == "sma":
+                results[name] = rolling_mean(close, window)
+            else:
+                results[name] = ema(close, window)
+        elif name in ("macd", "macds", "macdh"):
+            results.update(macd(close))
+        elif name == "rsi":
+            results[name] = rsi(close)
+        elif name in ("boll", "boll_ub", "boll_lb"):
+            results.update(boll(close))
+        elif name == "atr":
+            results[name] = atr(high, low, close)
+        elif name == "vwma":
+            results[name] = vwma(high, low, close, volume)
+        elif name == "mfi":
+            results[name] = mfi(high, low, close, volume)
+        else:
+            raise ValueError(
+                f"Indicator {name} is not supported by the numpy engine. "
+                f"Please choose from: {list(SUPPORTED_INDICATORS)}"
+            )
+
+    if squeeze:
+        return {name: values[:, 0] for name, values in results.items()}
+    return results
+
+
+def compute_indicator(indicator: str, close, high=None, low=None, volume=None):
+    """Single-indicator convenience wrapper around :func:`compute_indicators`."""
+    return compute_indicators([indicator], close, high, low, volume)[indicator]
+
+
+def build_price_panel(
+    frames: Mapping[str, pd.DataFrame],
+    date_column: str = "Date",
+) -> Tuple[pd.DatetimeIndex, List[str], Dict[str, np.ndarray]]:
+    """Align per-symbol price frames on the union of their dates.
+
+    Returns ``(dates, symbols, panel)`` where ``panel`` maps ``close``,
+    ``high``, ``low`` and ``volume`` to ``(dates, symbols)`` arrays with NaN
+    where a symbol has no bar.
+    """
+    symbols = list(frames)
+    columns = {"close": "Close", "high": "High", "low": "Low", "volume": "Volume"}
+    aligned = {key: {} for key in columns}
+    for symbol, frame in frames.items():
+        index = pd.to_datetime(frame[date_column].astype(str).str[:10])
+        for key, column in columns.items():
+            series = pd.Series(frame[column].to_numpy(dtype=np.float64), index=index)
+            aligned[key][symbol] = series[~series.index.duplicated()]
+
+    panel = {}
+    dates: Optional[pd.DatetimeIndex] = None
+    for key in columns:
+        table = pd.DataFrame(aligned[key]).sort_index()
+        dates = table.index
+        panel[key] = table[symbols].to_numpy()
+    return dates, symbols, panel
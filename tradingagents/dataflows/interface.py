@@ -1,17 +1,21 @@
-from typing import Annotated, Dict
-from .reddit_utils import fetch_top_from_category
+from typing import Annotated, Dict, Iterable, List, Optional, Tuple
+from .reddit_utils import fetch_top_from_category_range
 from .yfin_utils import *
 from .stockstats_utils import *
 from .googlenews_utils import *
+from .feednews_utils import getFeedNewsData
 from .finnhub_utils import get_data_in_range
+from .price_cache import prefetch_price_data
+from .price_store import get_price_store, read_price_range, yfin_csv_path
+from .trading_calendar import get_trading_calendar
+from .compact_format import format_series, format_table
+from .fundamentals_index import get_fundamentals_index
 from dateutil.relativedelta import relativedelta
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import json
 import os
 import pandas as pd
-from tqdm import tqdm
-import yfinance as yf
 from openai import OpenAI
 from .config import get_config, set_config, DATA_DIR
 
@@ -84,13 +88,10 @@ def get_finnhub_company_insider_sentiment(
     if len(data) == 0:
         return ""
 
-    result_str = ""
-    seen_dicts = []
-    for date, senti_list in data.items():
-        for entry in senti_list:
-            if entry not in seen_dicts:
-                result_str += f"### {entry['year']}-{entry['month']}:\nChange: {entry['change']}\nMonthly Share Purchase Ratio: {entry['mspr']}\n\n"
-                seen_dicts.append(entry)
+    result_str = "".join(
+        f"### {entry['year']}-{entry['month']}:\nChange: {entry['change']}\nMonthly Share Purchase Ratio: {entry['mspr']}\n\n"
+        for entry in data.unique_records()
+    )
 
     return (
         f"## {ticker} Insider Sentiment Data for {before} to {curr_date}:\n"
@@ -125,14 +126,10 @@ def get_finnhub_company_insider_transactions(
     if len(data) == 0:
         return ""
 
-    result_str = ""
-
-    seen_dicts = []
-    for date, senti_list in data.items():
-        for entry in senti_list:
-            if entry not in seen_dicts:
-                result_str += f"### Filing Date: {entry['filingDate']}, {entry['name']}:\nChange:{entry['change']}\nShares: {entry['share']}\nTransaction Price: {entry['transactionPrice']}\nTransaction Code: {entry['transactionCode']}\n\n"
-                seen_dicts.append(entry)
+    result_str = "".join(
+        f"### Filing Date: {entry['filingDate']}, {entry['name']}:\nChange:{entry['change']}\nShares: {entry['share']}\nTransaction Price: {entry['transactionPrice']}\nTransaction Code: {entry['transactionCode']}\n\n"
+        for entry in data.unique_records()
+    )
 
     return (
         f"## {ticker} insider transactions from {before} to {curr_date}:\n"
@@ -149,38 +146,16 @@ def get_simfin_balance_sheet(
     ],
     curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
 ):
-    data_path = os.path.join(
-        DATA_DIR,
-        "fundamental_data",
-        "simfin_data_all",
-        "balance_sheet",
-        "companies",
-        "us",
-        f"us-balance-{freq}.csv",
+    # latest statement published on or before the current date, see FundamentalsIndex
+    latest_balance_sheet = get_fundamentals_index(DATA_DIR).as_of(
+        "balance_sheet", freq, ticker, curr_date
     )
-    df = pd.read_csv(data_path, sep=";")
-
-    # Convert date strings to datetime objects and remove any time components
-    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
-    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
-
-    # Convert the current date to datetime and normalize
-    curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
-
-    # Filter the DataFrame for the given ticker and for reports that were published on or before the current date
-    filtered_df = df[(df["Ticker"] == ticker) & (df["Publish Date"] <= curr_date_dt)]
 
     # Check if there are any available reports; if not, return a notification
-    if filtered_df.empty:
+    if latest_balance_sheet is None:
         print("No balance sheet available before the given current date.")
         return ""
 
-    # Get the most recent balance sheet by selecting the row with the latest Publish Date
-    latest_balance_sheet = filtered_df.loc[filtered_df["Publish Date"].idxmax()]
-
-    # drop the SimFinID column
-    latest_balance_sheet = latest_balance_sheet.drop("SimFinId")
-
     return (
         f"## {freq} balance sheet for {ticker} released on {str(latest_balance_sheet['Publish Date'])[0:10]}: \n"
         + str(latest_balance_sheet)
@@ -196,38 +171,16 @@ def get_simfin_cashflow(
     ],
     curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
 ):
-    data_path = os.path.join(
-        DATA_DIR,
-        "fundamental_data",
-        "simfin_data_all",
-        "cash_flow",
-        "companies",
-        "us",
-        f"us-cashflow-{freq}.csv",
+    # latest statement published on or before the current date, see FundamentalsIndex
+    latest_cash_flow = get_fundamentals_index(DATA_DIR).as_of(
+        "cashflow", freq, ticker, curr_date
     )
-    df = pd.read_csv(data_path, sep=";")
-
-    # Convert date strings to datetime objects and remove any time components
-    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
-    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
-
-    # Convert the current date to datetime and normalize
-    curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
-
-    # Filter the DataFrame for the given ticker and for reports that were published on or before the current date
-    filtered_df = df[(df["Ticker"] == ticker) & (df["Publish Date"] <= curr_date_dt)]
 
     # Check if there are any available reports; if not, return a notification
-    if filtered_df.empty:
+    if latest_cash_flow is None:
         print("No cash flow statement available before the given current date.")
         return ""
 
-    # Get the most recent cash flow statement by selecting the row with the latest Publish Date
-    latest_cash_flow = filtered_df.loc[filtered_df["Publish Date"].idxmax()]
-
-    # drop the SimFinID column
-    latest_cash_flow = latest_cash_flow.drop("SimFinId")
-
     return (
         f"## {freq} cash flow statement for {ticker} released on {str(latest_cash_flow['Publish Date'])[0:10]}: \n"
         + str(latest_cash_flow)
@@ -243,38 +196,16 @@ def get_simfin_income_statements(
     ],
     curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
 ):
-    data_path = os.path.join(
-        DATA_DIR,
-        "fundamental_data",
-        "simfin_data_all",
-        "income_statements",
-        "companies",
-        "us",
-        f"us-income-{freq}.csv",
+    # latest statement published on or before the current date, see FundamentalsIndex
+    latest_income = get_fundamentals_index(DATA_DIR).as_of(
+        "income", freq, ticker, curr_date
     )
-    df = pd.read_csv(data_path, sep=";")
-
-    # Convert date strings to datetime objects and remove any time components
-    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
-    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
-
-    # Convert the current date to datetime and normalize
-    curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
-
-    # Filter the DataFrame for the given ticker and for reports that were published on or before the current date
-    filtered_df = df[(df["Ticker"] == ticker) & (df["Publish Date"] <= curr_date_dt)]
 
     # Check if there are any available reports; if not, return a notification
-    if filtered_df.empty:
+    if latest_income is None:
         print("No income statement available before the given current date.")
         return ""
 
-    # Get the most recent income statement by selecting the row with the latest Publish Date
-    latest_income = filtered_df.loc[filtered_df["Publish Date"].idxmax()]
-
-    # drop the SimFinID column
-    latest_income = latest_income.drop("SimFinId")
-
     return (
         f"## {freq} income statement for {ticker} released on {str(latest_income['Publish Date'])[0:10]}: \n"
         + str(latest_income)
@@ -282,6 +213,91 @@ def get_simfin_income_statements(
     )
 
 
+def get_simfin_statements_as_of(
+    pairs: Annotated[
+        Iterable[Tuple[str, str]], "(ticker, yyyy-mm-dd) pairs to look up"
+    ],
+    freq: Annotated[
+        str,
+        "reporting frequency of the company's financial history: annual / quarterly",
+    ],
+) -> pd.DataFrame:
+    """
+    Balance sheet, cash flow and income statement of every (ticker, date)
+    pair: the latest of each published on or before the date, found with one
+    as-of join per statement.
+    Returns a frame indexed by (Ticker, Date) in request order with
+    (statement, field) columns; rows are NaN where nothing was published yet.
+    """
+
+    return get_fundamentals_index(DATA_DIR).as_of_batch(pairs, freq)
+
+
+def get_fundamentals_memory_usage() -> Dict[str, int]:
+    """Resident bytes of the SimFin tables loaded in this process."""
+
+    return get_fundamentals_index(DATA_DIR).memory_usage()
+
+
+def get_fundamentals_bundle(
+    ticker: Annotated[str, "ticker symbol"],
+    curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
+    freq: Annotated[
+        str,
+        "reporting frequency of the company's financial history: annual / quarterly",
+    ] = "quarterly",
+    look_back_days: Annotated[int, "how many days of insider data to include"] = 30,
+) -> str:
+    """
+    The offline fundamentals of a company in one document: the latest
+    balance sheet, cash flow and income statement, and the insider sentiment
+    and transactions of the look-back window.
+    The five lookups are independent and run concurrently; sections with no
+    data are left out, and a section whose lookup fails is reported by name
+    instead of failing the whole bundle.
+    """
+
+    sections = [
+        ("balance sheet", get_simfin_balance_sheet, (ticker, freq, curr_date)),
+        ("cash flow statement", get_simfin_cashflow, (ticker, freq, curr_date)),
+        ("income statement", get_simfin_income_statements, (ticker, freq, curr_date)),
+        (
+            "insider sentiment",
+            get_finnhub_company_insider_sentiment,
+            (ticker, curr_date, look_back_days),
+        ),
+        (
+            "insider transactions",
+            get_finnhub_company_insider_transactions,
+            (ticker, curr_date, look_back_days),
+        ),
+    ]
+
+    with ThreadPoolExecutor(max_workers=len(sections)) as executor:
+        futures = [(name, executor.submit(fn, *args)) for name, fn, args in sections]
+
+    parts = []
+    missing = []
+    for name, future in futures:
+        try:
+            part = future.result()
+        except Exception as e:
+            print(f"Fundamentals bundle: {name} unavailable for {ticker}: {e}")
+            part = ""
+        if part:
+            parts.append(part)
+        else:
+            missing.append(name)
+
+    if not parts:
+        return ""
+    if missing:
+        parts.append(
+            f"Not available for {ticker} as of {curr_date}: {', '.join(missing)}."
+        )
+    return f"# {ticker} fundamentals as of {curr_date}\n\n" + "\n\n".join(parts)
+
+
 def get_google_news(
     query: Annotated[str, "Query to search with"],
     curr_date: Annotated[str, "Curr date in yyyy-mm-dd format"],
@@ -293,7 +309,8 @@ def get_google_news(
     before = start_date - relativedelta(days=look_back_days)
     before = before.strftime("%Y-%m-%d")
 
-    news_results = getNewsData(query, before, curr_date)
+    # one cached search per day, so consecutive windows only scrape new days
+    news_results = getNewsDataByDay(query, before, curr_date)
 
     news_str = ""
 
@@ -308,6 +325,33 @@ def get_google_news(
     return f"## {query} Google News, from {before} to {curr_date}:\n\n{news_str}"
 
 
+def get_feed_news(
+    query: Annotated[str, "Query to search with"],
+    curr_date: Annotated[str, "Curr date in yyyy-mm-dd format"],
+    look_back_days: Annotated[int, "how many days to look back"],
+) -> str:
+    query = query.replace(" ", "+")
+
+    start_date = datetime.strptime(curr_date, "%Y-%m-%d")
+    before = start_date - relativedelta(days=look_back_days)
+    before = before.strftime("%Y-%m-%d")
+
+    # one RSS document per feed instead of paginated search result pages
+    news_results = getFeedNewsData(query, before, curr_date)
+
+    news_str = ""
+
+    for news in news_results:
+        news_str += (
+            f"### {news['title']} (source: {news['source']}) \n\n{news['snippet']}\n\n"
+        )
+
+    if len(news_results) == 0:
+        return ""
+
+    return f"## {query} Feed News, from {before} to {curr_date}:\n\n{news_str}"
+
+
 def get_reddit_global_news(
     start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
     look_back_days: Annotated[int, "how many days to look back"],
@@ -326,26 +370,22 @@ def get_reddit_global_news(
     before = start_date - relativedelta(days=look_back_days)
     before = before.strftime("%Y-%m-%d")
 
+    # top posts of every day of the window, from one pass over the category
+    posts_by_day = fetch_top_from_category_range(
+        "global_news",
+        before,
+        start_date.strftime("%Y-%m-%d"),
+        max_limit_per_day,
+        data_path=os.path.join(DATA_DIR, "reddit_data"),
+    )
+
     posts = []
     # iterate from start_date to end_date
     curr_date = datetime.strptime(before, "%Y-%m-%d")
 
-    total_iterations = (start_date - curr_date).days + 1
-    pbar = tqdm(desc=f"Getting Global News on {start_date}", total=total_iterations)
-
     while curr_date <= start_date:
-        curr_date_str = curr_date.strftime("%Y-%m-%d")
-        fetch_result = fetch_top_from_category(
-            "global_news",
-            curr_date_str,
-            max_limit_per_day,
-            data_path=os.path.join(DATA_DIR, "reddit_data"),
-        )
-        posts.extend(fetch_result)
+        posts.extend(posts_by_day.get(curr_date.strftime("%Y-%m-%d"), []))
         curr_date += relativedelta(days=1)
-        pbar.update(1)
-
-    pbar.close()
 
     if len(posts) == 0:
         return ""
@@ -380,32 +420,24 @@ def get_reddit_company_news(
     before = start_date - relativedelta(days=look_back_days)
     before = before.strftime("%Y-%m-%d")
 
+    # top posts of every day of the window, from one pass over the category
+    posts_by_day = fetch_top_from_category_range(
+        "company_news",
+        before,
+        start_date.strftime("%Y-%m-%d"),
+        max_limit_per_day,
+        ticker,
+        data_path=os.path.join(DATA_DIR, "reddit_data"),
+    )
+
     posts = []
     # iterate from start_date to end_date
     curr_date = datetime.strptime(before, "%Y-%m-%d")
 
-    total_iterations = (start_date - curr_date).days + 1
-    pbar = tqdm(
-        desc=f"Getting Company News for {ticker} on {start_date}",
-        total=total_iterations,
-    )
-
     while curr_date <= start_date:
-        curr_date_str = curr_date.strftime("%Y-%m-%d")
-        fetch_result = fetch_top_from_category(
-            "company_news",
-            curr_date_str,
-            max_limit_per_day,
-            ticker,
-            data_path=os.path.join(DATA_DIR, "reddit_data"),
-        )
-        posts.extend(fetch_result)
+        posts.extend(posts_by_day.get(curr_date.strftime("%Y-%m-%d"), []))
         curr_date += relativedelta(days=1)
 
-        pbar.update(1)
-
-    pbar.close()
-
     if len(posts) == 0:
         return ""
 
@@ -511,44 +543,37 @@ def get_stock_stats_indicators_window(
     curr_date = datetime.strptime(curr_date, "%Y-%m-%d")
     before = curr_date - relativedelta(days=look_back_days)
 
-    if not online:
-        # read from YFin data
-        data = pd.read_csv(
-            os.path.join(
-                DATA_DIR,
-                f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-            )
+    # only the trading sessions of the window are reported, newest first
+    calendar = get_trading_calendar(
+        StockstatsUtils.get_price_file(
+            symbol, os.path.join(DATA_DIR, "market_data", "price_data"), online
         )
-        data["Date"] = pd.to_datetime(data["Date"], utc=True)
-        dates_in_df = data["Date"].astype(str).str[:10]
-
-        ind_string = ""
-        while curr_date >= before:
-            # only do the trading dates
-            if curr_date.strftime("%Y-%m-%d") in dates_in_df.values:
-                indicator_value = get_stockstats_indicator(
-                    symbol, indicator, curr_date.strftime("%Y-%m-%d"), online
-                )
-
-                ind_string += f"{curr_date.strftime('%Y-%m-%d')}: {indicator_value}\n"
-
-            curr_date = curr_date - relativedelta(days=1)
-    else:
-        # online gathering
-        ind_string = ""
-        while curr_date >= before:
-            indicator_value = get_stockstats_indicator(
-                symbol, indicator, curr_date.strftime("%Y-%m-%d"), online
-            )
+    )
 
-            ind_string += f"{curr_date.strftime('%Y-%m-%d')}: {indicator_value}\n"
+    # load the series and compute the indicator once for the whole window
+    indicator_values = get_stockstats_indicator_window(
+        symbol, indicator, before.strftime("%Y-%m-%d"), end_date, online
+    )
 
-            curr_date = curr_date - relativedelta(days=1)
+    if indicator_values is None:
+        return (
+            f"## {indicator} values from {before.strftime('%Y-%m-%d')} to {end_date}:\n\n"
+            f"Error: {indicator} could not be computed for {symbol}."
+        )
+
+    sessions = list(
+        calendar.iter_sessions(before.strftime("%Y-%m-%d"), end_date, reverse=True)
+    )
+    ind_string = format_series(
+        indicator_values.reindex(sessions),
+        value_label=indicator,
+        precision=get_config()["tool_output_indicator_precision"],
+    )
 
     result_str = (
         f"## {indicator} values from {before.strftime('%Y-%m-%d')} to {end_date}:\n\n"
         + ind_string
-        + "\n\n"
+        + "\n"
         + best_ind_params.get(indicator, "No description available.")
     )
 
@@ -584,6 +609,34 @@ def get_stockstats_indicator(
     return str(indicator_value)
 
 
+def get_stockstats_indicator_window(
+    symbol: Annotated[str, "ticker symbol of the company"],
+    indicator: Annotated[str, "technical indicator to get the analysis and report of"],
+    start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
+    end_date: Annotated[str, "End date in yyyy-mm-dd format"],
+    online: Annotated[bool, "to fetch data online or offline"],
+) -> Optional[pd.Series]:
+    """
+    Indicator values for every trading day in [start_date, end_date], indexed
+    by yyyy-mm-dd. Returns None if the indicator could not be computed.
+    """
+
+    try:
+        return StockstatsUtils.get_stock_stats_window(
+            symbol,
+            indicator,
+            start_date,
+            end_date,
+            os.path.join(DATA_DIR, "market_data", "price_data"),
+            online=online,
+        )
+    except Exception as e:
+        print(
+            f"Error getting stockstats indicator data for indicator {indicator} from {start_date} to {end_date}: {e}"
+        )
+        return None
+
+
 def get_YFin_data_window(
     symbol: Annotated[str, "ticker symbol of the company"],
     curr_date: Annotated[str, "Start date in yyyy-mm-dd format"],
@@ -594,34 +647,16 @@ def get_YFin_data_window(
     before = date_obj - relativedelta(days=look_back_days)
     start_date = before.strftime("%Y-%m-%d")
 
-    # read in data
-    data = pd.read_csv(
-        os.path.join(
-            DATA_DIR,
-            f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-        )
+    # read only the rows between the start and end dates (inclusive)
+    filtered_data = read_price_range(
+        yfin_csv_path(symbol, os.path.join(DATA_DIR, "market_data", "price_data")),
+        start_date,
+        curr_date,
     )
 
-    # Extract just the date part for comparison
-    data["DateOnly"] = data["Date"].str[:10]
-
-    # Filter data between the start and end dates (inclusive)
-    filtered_data = data[
-        (data["DateOnly"] >= start_date) & (data["DateOnly"] <= curr_date)
-    ]
-
-    # Drop the temporary column we created
-    filtered_data = filtered_data.drop("DateOnly", axis=1)
-
-    # Set pandas display options to show the full DataFrame
-    with pd.option_context(
-        "display.max_rows", None, "display.max_columns", None, "display.width", None
-    ):
-        df_string = filtered_data.to_string()
-
     return (
         f"## Raw Market Data for {symbol} from {start_date} to {curr_date}:\n\n"
-        + df_string
+        + format_table(filtered_data)
     )
 
 
@@ -634,8 +669,8 @@ def get_YFin_data_online(
     datetime.strptime(start_date, "%Y-%m-%d")
     datetime.strptime(end_date, "%Y-%m-%d")
 
-    # Create ticker object
-    ticker = yf.Ticker(symbol.upper())
+    # Reuse the ticker object of the symbol
+    ticker = get_ticker(symbol.upper())
 
     # Fetch historical data for the specified date range
     data = ticker.history(start=start_date, end=end_date)
@@ -650,14 +685,8 @@ def get_YFin_data_online(
     if data.index.tz is not None:
         data.index = data.index.tz_localize(None)
 
-    # Round numerical values to 2 decimal places for cleaner display
-    numeric_columns = ["Open", "High", "Low", "Close", "Adj Close"]
-    for col in numeric_columns:
-        if col in data.columns:
-            data[col] = data[col].round(2)
-
-    # Convert DataFrame to CSV string
-    csv_string = data.to_csv()
+    # Fixed precision, redundant columns folded into a note
+    csv_string = format_table(data.reset_index())
 
     # Add header information
     header = f"# Stock data for {symbol.upper()} from {start_date} to {end_date}\n"
@@ -667,34 +696,51 @@ def get_YFin_data_online(
     return header + csv_string
 
 
+def prefetch_YFin_data(
+    symbols: Annotated[List[str], "ticker symbols of the companies"],
+    online: Annotated[bool, "to fetch data online or offline"],
+) -> Dict[str, str]:
+    """
+    Warm the price data of many symbols before a batch of propagations.
+    Online, the price cache of all symbols is brought up to date with batched
+    multi-ticker downloads; offline, the price stores of the symbols are
+    compiled and mapped.
+    Returns the price file of every symbol that has one.
+    """
+
+    if online:
+        return prefetch_price_data(symbols)
+
+    price_files = {}
+    for symbol in symbols:
+        price_file = yfin_csv_path(
+            symbol, os.path.join(DATA_DIR, "market_data", "price_data")
+        )
+        try:
+            get_price_store(price_file)
+        except FileNotFoundError:
+            print(f"Prefetch: no offline price data for {symbol}")
+            continue
+        price_files[symbol] = price_file
+    return price_files
+
+
 def get_YFin_data(
     symbol: Annotated[str, "ticker symbol of the company"],
     start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
     end_date: Annotated[str, "End date in yyyy-mm-dd format"],
 ) -> str:
-    # read in data
-    data = pd.read_csv(
-        os.path.join(
-            DATA_DIR,
-            f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-        )
-    )
-
     if end_date > "2025-03-25":
         raise Exception(
             f"Get_YFin_Data: {end_date} is outside of the data range of 2015-01-01 to 2025-03-25"
         )
 
-    # Extract just the date part for comparison
-    data["DateOnly"] = data["Date"].str[:10]
-
-    # Filter data between the start and end dates (inclusive)
-    filtered_data = data[
-        (data["DateOnly"] >= start_date) & (data["DateOnly"] <= end_date)
-    ]
-
-    # Drop the temporary column we created
-    filtered_data = filtered_data.drop("DateOnly", axis=1)
+    # read only the rows between the start and end dates (inclusive)
+    filtered_data = read_price_range(
+        yfin_csv_path(symbol, os.path.join(DATA_DIR, "market_data", "price_data")),
+        start_date,
+        end_date,
+    )
 
     # remove the index from the dataframe
     filtered_data = filtered_data.reset_index(drop=True)
@@ -702,6 +748,23 @@ def get_YFin_data(
     return filtered_data
 
 
+def get_YFin_data_report(
+    symbol: Annotated[str, "ticker symbol of the company"],
+    start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
+    end_date: Annotated[str, "End date in yyyy-mm-dd format"],
+) -> str:
+    """get_YFin_data rendered as compact text for the market analyst."""
+    data = get_YFin_data(symbol, start_date, end_date)
+    if data.empty:
+        return (
+            f"No data found for symbol '{symbol}' between {start_date} and {end_date}"
+        )
+
+    header = f"# Stock data for {symbol.upper()} from {start_date} to {end_date}\n"
+    header += f"# Total records: {len(data)}\n\n"
+    return header + format_table(data)
+
+
 def get_stock_news_openai(ticker, curr_date):
     config = get_config()
     client = OpenAI(base_url=config["backend_url"])
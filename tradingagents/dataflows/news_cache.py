@@ -0,0 +1,78 @@
+"""Per-day disk cache of parsed Google News results.
+
+Entries are keyed by (query, day) so overlapping look-back windows share
+the days they have in common. A day that was fetched after it ended is
+final and never expires; a day fetched while it was still going on (today,
+or a future date) expires after ``google_news_today_ttl_seconds``.
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from datetime import date as Date
+from typing import Annotated, Dict, List, Optional
+
+from .config import get_config
+
+CACHE_DIR_NAME = "google_news"
+
+
+def _query_dir(query: str) -> str:
+    # readable prefix plus a digest, so distinct queries never share a folder
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", query).strip("_")[:40]
+    digest = hashlib.sha1(query.encode()).hexdigest()[:12]
+    return os.path.join(
+        get_config()["data_cache_dir"], CACHE_DIR_NAME, f"{slug}-{digest}"
+    )
+
+
+def _entry_path(query: str, day: str) -> str:
+    return os.path.join(_query_dir(query), f"{day}.json")
+
+
+def _is_fresh(day: str, fetched_at: float, now: float) -> bool:
+    fetched_on = Date.fromtimestamp(fetched_at).isoformat()
+    if day < fetched_on:
+        return True
+    return now - fetched_at < get_config()["google_news_today_ttl_seconds"]
+
+
+def load_day(
+    query: Annotated[str, "search query"],
+    day: Annotated[str, "yyyy-mm-dd"],
+    now: Annotated[Optional[float], "current epoch time, defaults to now"] = None,
+) -> Optional[List[Dict[str, str]]]:
+    """Cached results of ``query`` on ``day``, or None if missing or expired."""
+    try:
+        with open(_entry_path(query, day)) as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if entry.get("query") != query:
+        return None
+    if not _is_fresh(day, entry["fetched_at"], time.time() if now is None else now):
+        return None
+    return entry["results"]
+
+
+def save_day(
+    query: Annotated[str, "search query"],
+    day: Annotated[str, "yyyy-mm-dd"],
+    results: List[Dict[str, str]],
+    now: Annotated[Optional[float], "fetch epoch time, defaults to now"] = None,
+):
+    path = _entry_path(query, day)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    entry = {
+        "query": query,
+        "day": day,
+        "fetched_at": time.time() if now is None else now,
+        "results": results,
+    }
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "w") as f:
+        json.dump(entry, f)
+    os.replace(tmp_path, path)
+
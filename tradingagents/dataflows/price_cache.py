@@ -0,0 +1,262 @@
+import json
+import os
+import re
+import threading
+from typing import Annotated, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from .config import get_config
+
+MANIFEST_NAME = "price_cache_manifest.json"
+# adjustment mode of the cached bars, a change forces a full re-download
+AUTO_ADJUST = True
+HISTORY_YEARS = 15
+
+_lock = threading.RLock()
+
+
+def _cache_dir() -> str:
+    cache_dir = get_config()["data_cache_dir"]
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
+def _load_manifest(cache_dir: str) -> Dict[str, Dict]:
+    try:
+        with open(os.path.join(cache_dir, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(cache_dir: str, manifest: Dict[str, Dict]):
+    path = os.path.join(cache_dir, MANIFEST_NAME)
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _download(symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
+    data = yf.download(
+        symbol,
+        start=start_date,
+        end=end_date,
+        multi_level_index=False,
+        progress=False,
+        auto_adjust=AUTO_ADJUST,
+    )
+    return data.reset_index()
+
+
+def _manifest_entry(data: pd.DataFrame, data_file: str, today: str) -> Dict:
+    dates = pd.to_datetime(data["Date"]).dt.strftime("%Y-%m-%d")
+    return {
+        "file": os.path.basename(data_file),
+        "first_bar_date": dates.iloc[0],
+        "last_bar_date": dates.iloc[-1],
+        "last_close": float(data["Close"].iloc[-1]),
+        "auto_adjust": AUTO_ADJUST,
+        "checked_on": today,
+    }
+
+
+def _apply_tail(data_file: str, entry: Dict, tail: pd.DataFrame, today: str) -> bool:
+    """Append the bars of ``tail`` that come after ``last_bar_date``.
+
+    ``tail`` must start at the last cached bar. If that bar's close moved, a
+    dividend or split re-adjusted the history and False is returned so the
+    caller re-downloads the whole series.
+    """
+    if tail.empty:
+        entry["checked_on"] = today
+        return True
+
+    dates = pd.to_datetime(tail["Date"]).dt.strftime("%Y-%m-%d")
+    overlap = tail[dates == entry["last_bar_date"]]
+    if overlap.empty or not np.isclose(
+        float(overlap["Close"].iloc[0]), entry["last_close"], rtol=1e-6
+    ):
+        return False
+
+    new_bars = tail[dates > entry["last_bar_date"]]
+    if not new_bars.empty:
+        with open(data_file) as f:
+            columns = f.readline().strip().split(",")
+        new_bars[columns].to_csv(data_file, mode="a", header=False, index=False)
+        first_bar_date = entry["first_bar_date"]
+        entry.update(_manifest_entry(new_bars, data_file, today))
+        entry["first_bar_date"] = first_bar_date
+    entry["checked_on"] = today
+    return True
+
+
+def _append_tail(symbol: str, data_file: str, entry: Dict, today: str) -> bool:
+    """Fetch the bars from ``last_bar_date`` on and append the new ones."""
+    return _apply_tail(
+        data_file, entry, _download(symbol, entry["last_bar_date"], today), today
+    )
+
+
+def _store_full(
+    cache_dir: str,
+    manifest: Dict[str, Dict],
+    symbol: str,
+    data: pd.DataFrame,
+    today: str,
+) -> str:
+    data_file = _data_file(cache_dir, symbol)
+    data.to_csv(data_file, index=False)
+    if data.empty:
+        manifest.pop(symbol, None)
+    else:
+        manifest[symbol] = _manifest_entry(data, data_file, today)
+    _prune_snapshots(cache_dir, symbol)
+    return data_file
+
+
+def _prune_snapshots(cache_dir: str, symbol: str):
+    """Remove the per-day ``{symbol}-YFin-data-{start}-{end}.csv`` snapshots."""
+    pattern = re.compile(
+        re.escape(symbol) + r"-YFin-data-\d{4}-\d{2}-\d{2}-\d{4}-\d{2}-\d{2}\.csv$"
+    )
+    for name in os.listdir(cache_dir):
+        if pattern.match(name):
+            try:
+                os.remove(os.path.join(cache_dir, name))
+            except OSError:
+                pass
+
+
+def _data_file(cache_dir: str, symbol: str) -> str:
+    return os.path.join(cache_dir, f"{symbol}-YFin-data.csv")
+
+
+def _reusable(entry: Optional[Dict], data_file: str) -> bool:
+    return (
+        entry is not None
+        and entry.get("auto_adjust") == AUTO_ADJUST
+        and os.path.exists(data_file)
+    )
+
+
+def _history_start(today_date: pd.Timestamp) -> str:
+    return (today_date - pd.DateOffset(years=HISTORY_YEARS)).strftime("%Y-%m-%d")
+
+
+def get_cached_price_file(
+    symbol: Annotated[str, "ticker symbol of the company"],
+) -> str:
+    """Return the path of the incrementally maintained price CSV for ``symbol``.
+
+    One file per symbol is kept in ``data_cache_dir`` together with a manifest
+    recording the last cached bar and the adjustment mode. At most one
+    request per symbol and day goes to Yahoo Finance, and it only asks for the
+    bars after the last cached one.
+    """
+    today_date = pd.Timestamp.today()
+    today = today_date.strftime("%Y-%m-%d")
+
+    with _lock:
+        cache_dir = _cache_dir()
+        manifest = _load_manifest(cache_dir)
+        entry = manifest.get(symbol)
+        data_file = _data_file(cache_dir, symbol)
+
+        if _reusable(entry, data_file):
+            if entry["checked_on"] == today:
+                return data_file
+            if _append_tail(symbol, data_file, entry, today):
+                manifest[symbol] = entry
+                _save_manifest(cache_dir, manifest)
+                return data_file
+
+        data = _download(symbol, _history_start(today_date), today)
+        data_file = _store_full(cache_dir, manifest, symbol, data, today)
+        _save_manifest(cache_dir, manifest)
+        return data_file
+
+
+def _download_many(
+    symbols: List[str], start_date: str, end_date: str
+) -> Dict[str, pd.DataFrame]:
+    """One multi-ticker request, split back into per-symbol frames."""
+    if not symbols:
+        return {}
+    data = yf.download(
+        symbols,
+        start=start_date,
+        end=end_date,
+        group_by="ticker",
+        progress=False,
+        auto_adjust=AUTO_ADJUST,
+    )
+    frames = {}
+    for symbol in symbols:
+        if isinstance(data.columns, pd.MultiIndex):
+            if symbol not in data.columns.get_level_values(0):
+                frames[symbol] = pd.DataFrame()
+                continue
+            frame = data[symbol]
+        else:
+            frame = data
+        frame = frame.dropna(how="all")
+        frame.columns.name = None
+        frames[symbol] = frame.reset_index()
+    return frames
+
+
+def prefetch_price_data(
+    symbols: Annotated[List[str], "ticker symbols to fill the price cache for"],
+    start_date: Annotated[
+        Optional[str], "earliest bar wanted, yyyy-mm-dd; defaults to 15 years back"
+    ] = None,
+) -> Dict[str, str]:
+    """Bring the price cache of many symbols up to date with batched requests.
+
+    Symbols already checked today are skipped, cached symbols share a single
+    multi-ticker request for their missing tail bars, and uncached ones share
+    a single request for their full history. Returns the cache file of every
+    symbol.
+    """
+    today_date = pd.Timestamp.today()
+    today = today_date.strftime("%Y-%m-%d")
+    history_start = _history_start(today_date)
+    if start_date is not None:
+        history_start = min(history_start, start_date)
+
+    with _lock:
+        cache_dir = _cache_dir()
+        manifest = _load_manifest(cache_dir)
+        symbols = list(dict.fromkeys(symbols))
+
+        stale, missing = [], []
+        for symbol in symbols:
+            entry = manifest.get(symbol)
+            if not _reusable(entry, _data_file(cache_dir, symbol)):
+                missing.append(symbol)
+            elif entry["checked_on"] != today:
+                stale.append(symbol)
+
+        if stale:
+            tail_start = min(manifest[symbol]["last_bar_date"] for symbol in stale)
+            tails = _download_many(stale, tail_start, today)
+            for symbol in stale:
+                entry = manifest[symbol]
+                if _apply_tail(
+                    _data_file(cache_dir, symbol), entry, tails[symbol], today
+                ):
+                    manifest[symbol] = entry
+                else:
+                    missing.append(symbol)
+
+        for symbol, data in _download_many(missing, history_start, today).items():
+            _store_full(cache_dir, manifest, symbol, data, today)
+
+        if stale or missing:
+            _save_manifest(cache_dir, manifest)
+
+        return {symbol: _data_file(cache_dir, symbol) for symbol in symbols}
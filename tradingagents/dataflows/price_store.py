@@ -0,0 +1,452 @@
+import io
+import json
+import os
+import shutil
+from typing import Annotated, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .config import get_config
+from .store_utils import (
+    StoreCache,
+    make_tmp_dir,
+    meta_is_current,
+    store_name,
+    swap_in,
+    write_meta,
+)
+
+# layout version of the price stores
+STORE_VERSION = 1
+# CSV rows parsed at a time while compiling a store
+BUILD_CHUNK_ROWS = 100_000
+
+
+def _store_root() -> str:
+    config = get_config()
+    return config.get("price_store_dir") or os.path.join(
+        config["data_cache_dir"], "price_store"
+    )
+
+
+def to_day(value) -> np.datetime64:
+    """Normalize a yyyy-mm-dd string (or anything pandas can parse) to a day."""
+    if isinstance(value, str) and len(value) >= 10:
+        try:
+            return np.datetime64(value[:10], "D")
+        except ValueError:
+            pass
+    return np.datetime64(pd.Timestamp(value).date(), "D")
+
+
+class PriceStore:
+    """Columnar, memory-mapped copy of a Yahoo Finance price CSV.
+
+    Every column is kept in its own ``.npy`` file next to a sorted
+    ``datetime64[D]`` date index, so a date-range query is two bisects
+    followed by a zero-copy slice of the mapped arrays.
+    """
+
+    def __init__(
+        self,
+        source_path: Annotated[str, "path of the CSV the store was built from"],
+        columns: List[str],
+        arrays: Dict[str, np.ndarray],
+        dates: np.ndarray,
+        rows: Optional[np.ndarray] = None,
+    ):
+        self.source_path = source_path
+        self.columns = columns
+        self.dates = dates
+        self._arrays = arrays
+        # original CSV row numbers, only kept when the source was not sorted
+        self._rows = rows
+        # (mtime_ns, size) of the source when the store was opened
+        self.version: Tuple[int, int] = (0, 0)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def bounds(
+        self,
+        start_date: Annotated[Optional[str], "first day (inclusive), yyyy-mm-dd"],
+        end_date: Annotated[Optional[str], "last day (inclusive), yyyy-mm-dd"],
+    ) -> Tuple[int, int]:
+        """Return the ``[lo, hi)`` row range covering the given days."""
+        lo = 0
+        hi = len(self.dates)
+        if start_date is not None:
+            lo = int(np.searchsorted(self.dates, to_day(start_date), side="left"))
+        if end_date is not None:
+            hi = int(np.searchsorted(self.dates, to_day(end_date), side="right"))
+        return lo, max(lo, hi)
+
+    def locate(self, day) -> Optional[int]:
+        """Row of the first bar on ``day``, or None if it is not a trading day."""
+        day = to_day(day)
+        i = int(np.searchsorted(self.dates, day, side="left"))
+        if i < len(self.dates) and self.dates[i] == day:
+            return i
+        return None
+
+    def column(self, name: str, lo: int = 0, hi: Optional[int] = None) -> np.ndarray:
+        """Zero-copy view of a column between rows ``lo`` and ``hi``."""
+        return self._arrays[name][lo:hi]
+
+    def index(self, lo: int = 0, hi: Optional[int] = None) -> pd.Index:
+        if hi is None:
+            hi = len(self.dates)
+        if self._rows is None:
+            return pd.RangeIndex(lo, hi)
+        return pd.Index(self._rows[lo:hi])
+
+    def frame(self, lo: int = 0, hi: Optional[int] = None) -> pd.DataFrame:
+        """Materialize rows ``lo`` to ``hi`` as a DataFrame shaped like the CSV."""
+        if hi is None:
+            hi = len(self.dates)
+        data = {}
+        for name in self.columns:
+            values = self._arrays[name][lo:hi]
+            if values.dtype.kind == "U":
+                values = values.astype(object)
+            data[name] = values
+        return pd.DataFrame(data, index=self.index(lo, hi), columns=self.columns)
+
+    def window(
+        self,
+        start_date: Annotated[Optional[str], "first day (inclusive), yyyy-mm-dd"],
+        end_date: Annotated[Optional[str], "last day (inclusive), yyyy-mm-dd"],
+    ) -> pd.DataFrame:
+        """Rows whose date falls between ``start_date`` and ``end_date`` inclusive."""
+        return self.frame(*self.bounds(start_date, end_date))
+
+    @classmethod
+    def from_frame(
+        cls,
+        data: pd.DataFrame,
+        source_path: str = "",
+        date_column: str = "Date",
+    ) -> "PriceStore":
+        """Build an in-memory store from an already loaded price DataFrame."""
+        columns = [str(c) for c in data.columns]
+        dates = (
+            pd.to_datetime(data[date_column].astype(str).str[:10])
+            .values.astype("datetime64[D]")
+        )
+        rows = None
+        if len(dates) > 1 and not (dates[1:] >= dates[:-1]).all():
+            rows = np.argsort(dates, kind="stable")
+            dates = dates[rows]
+
+        arrays = {}
+        for name, col in zip(columns, data.columns):
+            values = data[col].to_numpy()
+            if values.dtype == object:
+                values = data[col].astype(str).to_numpy().astype(str)
+            elif values.dtype.kind == "M":
+                values = data[col].astype(str).to_numpy().astype(str)
+            if rows is not None:
+                values = values[rows]
+            arrays[name] = values
+        return cls(source_path, columns, arrays, dates, rows)
+
+    def save(self, store_dir: str, source_stat: os.stat_result):
+        """Write the store to ``store_dir`` atomically (build aside, then swap)."""
+        tmp_dir = make_tmp_dir(store_dir)
+        np.save(os.path.join(tmp_dir, "date.npy"), self.dates)
+        if self._rows is not None:
+            np.save(os.path.join(tmp_dir, "rows.npy"), self._rows)
+        for i, name in enumerate(self.columns):
+            np.save(os.path.join(tmp_dir, f"col{i}.npy"), self._arrays[name])
+        write_meta(
+            tmp_dir,
+            self.source_path,
+            source_stat,
+            STORE_VERSION,
+            columns=self.columns,
+            sorted=self._rows is None,
+        )
+        swap_in(tmp_dir, store_dir)
+
+    @classmethod
+    def open(cls, store_dir: str, source_path: str) -> "PriceStore":
+        """Memory-map a store previously written with :meth:`save`."""
+        with open(os.path.join(store_dir, "meta.json")) as f:
+            meta = json.load(f)
+
+        def _load(name):
+            return np.load(os.path.join(store_dir, name), mmap_mode="r")
+
+        arrays = {
+            name: _load(f"col{i}.npy") for i, name in enumerate(meta["columns"])
+        }
+        rows = None if meta["sorted"] else _load("rows.npy")
+        return cls(source_path, meta["columns"], arrays, _load("date.npy"), rows)
+
+
+class CsvOffsetIndex:
+    """Byte offset and day of every row of a price CSV.
+
+    A date range is read straight from the file: two bisects give the rows,
+    one seek and one read fetch their bytes, and only those rows are parsed,
+    so memory follows the size of the window rather than of the file.
+    """
+
+    def __init__(
+        self,
+        csv_path: str,
+        header: bytes,
+        dates: np.ndarray,
+        offsets: Annotated[np.ndarray, "row start offsets plus the end of file"],
+        date_width: int,
+    ):
+        self.csv_path = csv_path
+        self.header = header
+        self.offsets = offsets
+        self.date_width = date_width
+        # file row of every entry of ``dates``, only kept when the file is unsorted
+        self.order: Optional[np.ndarray] = None
+        if len(dates) > 1 and not (dates[1:] >= dates[:-1]).all():
+            self.order = np.argsort(dates, kind="stable")
+            dates = dates[self.order]
+        self.dates = dates
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    @classmethod
+    def scan(cls, csv_path: str, date_column: str = "Date") -> "CsvOffsetIndex":
+        """Index ``csv_path`` in one streaming pass over its lines."""
+        offsets, days, width = [], [], 1
+        with open(csv_path, "rb") as f:
+            header = f.readline()
+            names = header.decode().strip().split(",")
+            pos = names.index(date_column)
+            offset = f.tell()
+            for line in f:
+                if line.strip():
+                    field = line.split(b",", pos + 1)[pos].strip()
+                    offsets.append(offset)
+                    days.append(field[:10])
+                    width = max(width, len(field))
+                offset += len(line)
+        offsets.append(offset)
+        if not header.endswith(b"\n"):
+            header += b"\n"
+        dates = np.array(days, dtype="S10").astype("datetime64[D]")
+        return cls(csv_path, header, dates, np.array(offsets, dtype=np.int64), width)
+
+    def bounds(
+        self,
+        start_date: Annotated[Optional[str], "first day (inclusive), yyyy-mm-dd"],
+        end_date: Annotated[Optional[str], "last day (inclusive), yyyy-mm-dd"],
+    ) -> Tuple[int, int]:
+        lo = 0
+        hi = len(self.dates)
+        if start_date is not None:
+            lo = int(np.searchsorted(self.dates, to_day(start_date), side="left"))
+        if end_date is not None:
+            hi = int(np.searchsorted(self.dates, to_day(end_date), side="right"))
+        return lo, max(lo, hi)
+
+    def read(
+        self,
+        start_date: Annotated[Optional[str], "first day (inclusive), yyyy-mm-dd"],
+        end_date: Annotated[Optional[str], "last day (inclusive), yyyy-mm-dd"],
+    ) -> pd.DataFrame:
+        """Rows between the two days, indexed like :meth:`PriceStore.window`."""
+        lo, hi = self.bounds(start_date, end_date)
+        with open(self.csv_path, "rb") as f:
+            if self.order is None:
+                f.seek(self.offsets[lo])
+                body = f.read(self.offsets[hi] - self.offsets[lo])
+                index = pd.RangeIndex(lo, hi)
+            else:
+                rows = self.order[lo:hi]
+                lines = []
+                for row in rows:
+                    f.seek(self.offsets[row])
+                    line = f.read(self.offsets[row + 1] - self.offsets[row])
+                    lines.append(line if line.endswith(b"\n") else line + b"\n")
+                body = b"".join(lines)
+                index = pd.Index(rows)
+            if lo == hi and len(self.offsets) > 1:
+                # parse one row so an empty window keeps the column dtypes
+                f.seek(self.offsets[0])
+                body = f.read(self.offsets[1] - self.offsets[0])
+        data = pd.read_csv(io.BytesIO(self.header + body)).iloc[: hi - lo]
+        data.index = index
+        return data
+
+
+def _compile(
+    csv_path: str,
+    store_dir: str,
+    source_stat: os.stat_result,
+    date_column: str = "Date",
+) -> bool:
+    """Compile ``csv_path`` into ``store_dir`` without loading it whole.
+
+    Rows are parsed ``BUILD_CHUNK_ROWS`` at a time and written into
+    preallocated memory-mapped columns. Returns False, leaving nothing
+    behind, for files this cannot handle (text columns besides the date,
+    dtypes that change between chunks); the caller then loads the file whole.
+    """
+    index = CsvOffsetIndex.scan(csv_path, date_column)
+    n = len(index)
+    position = None
+    if index.order is not None:
+        position = np.empty(n, dtype=np.int64)
+        position[index.order] = np.arange(n)
+
+    tmp_dir = make_tmp_dir(store_dir)
+    try:
+        columns: List[str] = []
+        arrays: Dict[str, np.ndarray] = {}
+        start = 0
+        for chunk in pd.read_csv(csv_path, chunksize=BUILD_CHUNK_ROWS):
+            if not columns:
+                columns = [str(c) for c in chunk.columns]
+                for i, (name, col) in enumerate(zip(columns, chunk.columns)):
+                    if name == date_column:
+                        dtype = np.dtype(f"<U{index.date_width}")
+                    elif chunk[col].dtype.kind in "biuf":
+                        dtype = chunk[col].dtype
+                    else:
+                        return False
+                    arrays[name] = np.lib.format.open_memmap(
+                        os.path.join(tmp_dir, f"col{i}.npy"),
+                        mode="w+",
+                        dtype=dtype,
+                        shape=(n,),
+                    )
+
+            stop = start + len(chunk)
+            if stop > n:
+                return False
+            target = slice(start, stop) if position is None else position[start:stop]
+            for name, col in zip(columns, chunk.columns):
+                if name == date_column:
+                    values = chunk[col].astype(str).to_numpy().astype(str)
+                else:
+                    values = chunk[col].to_numpy()
+                if not np.can_cast(values.dtype, arrays[name].dtype, "safe"):
+                    return False
+                arrays[name][target] = values
+            start = stop
+
+        if not columns or start != n:
+            return False
+        for values in arrays.values():
+            values.flush()
+        del arrays
+
+        np.save(os.path.join(tmp_dir, "date.npy"), index.dates)
+        if index.order is not None:
+            np.save(os.path.join(tmp_dir, "rows.npy"), index.order)
+        write_meta(
+            tmp_dir,
+            csv_path,
+            source_stat,
+            STORE_VERSION,
+            columns=columns,
+            sorted=index.order is None,
+        )
+        swap_in(tmp_dir, store_dir)
+        return True
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _store_dir_for(csv_path: str) -> str:
+    return os.path.join(_store_root(), store_name(csv_path))
+
+
+_price_stores: StoreCache[PriceStore] = StoreCache()
+# versions of the CSVs whose store could not be written to disk
+_unpersisted: Dict[str, Tuple[int, int]] = {}
+
+
+def get_price_store(
+    csv_path: Annotated[str, "path of a Yahoo Finance price CSV"],
+    in_memory: Annotated[
+        bool, "load the CSV into memory when the store cannot be written"
+    ] = True,
+) -> Optional[PriceStore]:
+    """Return the memory-mapped store for ``csv_path``, compiling it on first use.
+
+    The store is rebuilt whenever the CSV's size or mtime changes, and open
+    stores are shared across calls in the process. If the store cannot be
+    written, the CSV is loaded into memory, or None is returned when
+    ``in_memory`` is False.
+    """
+
+    def load(csv_path: str, source_stat: os.stat_result) -> Optional[PriceStore]:
+        key = os.path.abspath(csv_path)
+        version = (source_stat.st_mtime_ns, source_stat.st_size)
+        persisted = _unpersisted.get(key) != version
+        if not persisted and not in_memory:
+            return None
+
+        store = None
+        store_dir = _store_dir_for(csv_path)
+        if meta_is_current(store_dir, csv_path, source_stat, STORE_VERSION):
+            store = PriceStore.open(store_dir, csv_path)
+        elif persisted:
+            try:
+                os.makedirs(os.path.dirname(store_dir), exist_ok=True)
+                if not _compile(csv_path, store_dir, source_stat):
+                    PriceStore.from_frame(pd.read_csv(csv_path), csv_path).save(
+                        store_dir, source_stat
+                    )
+                store = PriceStore.open(store_dir, csv_path)
+            except OSError as e:
+                # a read-only cache dir only costs us the mmap
+                print(f"Price store: could not persist {store_dir}: {e}")
+                _unpersisted[key] = version
+                if not in_memory:
+                    return None
+        if store is None:
+            store = PriceStore.from_frame(pd.read_csv(csv_path), csv_path)
+
+        store.version = version
+        return store
+
+    return _price_stores.get(csv_path, load)
+
+
+_offset_indexes: StoreCache[CsvOffsetIndex] = StoreCache()
+
+
+def get_csv_offset_index(
+    csv_path: Annotated[str, "path of a Yahoo Finance price CSV"],
+) -> CsvOffsetIndex:
+    """Offset index of ``csv_path``, rescanned whenever the file changes."""
+    return _offset_indexes.get(
+        csv_path, lambda csv_path, source_stat: CsvOffsetIndex.scan(csv_path)
+    )
+
+
+def read_price_range(
+    csv_path: Annotated[str, "path of a Yahoo Finance price CSV"],
+    start_date: Annotated[Optional[str], "first day (inclusive), yyyy-mm-dd"],
+    end_date: Annotated[Optional[str], "last day (inclusive), yyyy-mm-dd"],
+) -> pd.DataFrame:
+    """Rows of ``csv_path`` between two days (inclusive), shaped like the CSV.
+
+    Only the requested rows are materialized: they are sliced out of the
+    memory-mapped store, or read through the CSV's offset index when no
+    store can be written.
+    """
+    store = get_price_store(csv_path, in_memory=False)
+    if store is None:
+        return get_csv_offset_index(csv_path).read(start_date, end_date)
+    return store.window(start_date, end_date)
+
+
+def yfin_csv_path(
+    symbol: Annotated[str, "ticker symbol of the company"],
+    data_dir: Annotated[str, "directory holding the YFin price CSVs"],
+) -> str:
+    return os.path.join(data_dir, f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv")
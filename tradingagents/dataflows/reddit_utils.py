@@ -1,12 +1,37 @@
 import requests
 import time
 import json
+import bisect
+import functools
+import heapq
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta
 from contextlib import contextmanager
-from typing import Annotated
+from typing import Annotated, Dict, Iterator, List, Optional, Tuple
 import os
 import re
 
+import numpy as np
+
+from .config import get_config
+from .store_utils import (
+    StoreCache,
+    make_tmp_dir,
+    open_or_build,
+    store_name,
+    swap_in,
+    write_meta,
+)
+
+# layout version of the subreddit date indexes
+REDDIT_INDEX_VERSION = 1
+# most posts handed to one worker of a parallel scan; longer windows of a
+# subreddit are split into several runs of whole days
+REDDIT_SCAN_CHUNK_ROWS = 50_000
+
 ticker_to_company = {
     "AAPL": "Apple",
     "MSFT": "Microsoft",
@@ -49,22 +74,321 @@ ticker_to_company = {
 }
 
 
-def fetch_top_from_category(
+# a top-level numeric ``created_utc`` read straight from the raw line
+_CREATED_UTC_KEY = b'"created_utc"'
+_CREATED_UTC = re.compile(rb'"created_utc"\s*:\s*(-?\d+(\.\d+)?([eE][-+]?\d+)?)\s*[,}]')
+
+
+@functools.lru_cache(maxsize=None)
+def _utc_day(days: int) -> str:
+    return (datetime(1970, 1, 1) + timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+def _post_date(line: bytes) -> str:
+    """UTC posting date of a JSONL post line, as ``YYYY-MM-DD``.
+
+    The timestamp is parsed from the raw bytes; the line is only decoded as
+    JSON when that is ambiguous (no match, or ``created_utc`` appearing more
+    than once, e.g. in a nested crosspost).
+    """
+    match = _CREATED_UTC.search(line)
+    if match is None or line.count(_CREATED_UTC_KEY) != 1:
+        created_utc = json.loads(line)["created_utc"]
+    elif match.group(2) is None and match.group(3) is None:
+        # whole seconds: the day is exact integer division
+        return _utc_day(int(match.group(1)) // 86400)
+    else:
+        created_utc = float(match.group(1))
+    return datetime.utcfromtimestamp(created_utc).strftime("%Y-%m-%d")
+
+
+class RedditIndex:
+    """Posts of a subreddit ``.jsonl`` file partitioned by UTC posting date.
+
+    Only the byte offset and length of every post line are stored, grouped
+    by date and in file order within a date, so a day's posts are read and
+    parsed straight from the source file without touching the other days.
+    """
+
+    def __init__(
+        self,
+        source_path: str,
+        dates: List[str],
+        day_offsets: Annotated[np.ndarray, "first row of each date and the row count"],
+        offsets: np.ndarray,
+        lengths: np.ndarray,
+    ):
+        self.source_path = source_path
+        self.dates = dates
+        self.day_offsets = day_offsets
+        self.offsets = offsets
+        self.lengths = lengths
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def split(
+        self,
+        start_date: Annotated[str, "first date (inclusive), YYYY-MM-DD"],
+        end_date: Annotated[str, "last date (inclusive), YYYY-MM-DD"],
+        max_rows: Annotated[int, "most posts per span, unless a day has more"],
+    ) -> List[Tuple[str, str]]:
+        """Consecutive ``(first date, last date)`` spans covering the posts of
+        the window, each of whole days and at most ``max_rows`` posts."""
+        lo = bisect.bisect_left(self.dates, start_date)
+        hi = max(lo, bisect.bisect_right(self.dates, end_date))
+        spans = []
+        first = lo
+        for day in range(lo + 1, hi + 1):
+            rows = self.day_offsets[min(day + 1, hi)] - self.day_offsets[first]
+            if day == hi or rows > max_rows:
+                spans.append((self.dates[first], self.dates[day - 1]))
+                first = day
+        return spans
+
+    def range(
+        self,
+        start_date: Annotated[str, "first date (inclusive), YYYY-MM-DD"],
+        end_date: Annotated[str, "last date (inclusive), YYYY-MM-DD"],
+    ) -> Iterator[Tuple[str, dict]]:
+        """``(date, parsed post)`` of every post within the window, by date
+        and in file order within a date, from a single pass over the file."""
+        lo = bisect.bisect_left(self.dates, start_date)
+        hi = max(lo, bisect.bisect_right(self.dates, end_date))
+        if lo == hi:
+            return
+        with open(self.source_path, "rb") as f:
+            for day in range(lo, hi):
+                date = self.dates[day]
+                first, last = int(self.day_offsets[day]), int(self.day_offsets[day + 1])
+                for offset, length in zip(
+                    self.offsets[first:last].tolist(), self.lengths[first:last].tolist()
+                ):
+                    f.seek(offset)
+                    yield date, json.loads(f.read(length))
+
+    @classmethod
+    def build(cls, source_path: str, store_dir: str, source_stat: os.stat_result):
+        """Scan ``source_path`` once and write its index to ``store_dir``."""
+        rows = []
+        offset = 0
+        with open(source_path, "rb") as f:
+            for line in f:
+                if line.strip():
+                    rows.append((_post_date(line), offset, len(line)))
+                offset += len(line)
+        # stable, so posts of one date stay in file order
+        rows.sort(key=lambda row: row[0])
+
+        dates = []
+        day_offsets = []
+        for i, (post_date, _, _) in enumerate(rows):
+            if not dates or dates[-1] != post_date:
+                dates.append(post_date)
+                day_offsets.append(i)
+        day_offsets.append(len(rows))
+
+        tmp_dir = make_tmp_dir(store_dir)
+        np.save(
+            os.path.join(tmp_dir, "day_offsets.npy"), np.array(day_offsets, np.int64)
+        )
+        np.save(
+            os.path.join(tmp_dir, "offsets.npy"),
+            np.array([row[1] for row in rows], np.int64),
+        )
+        np.save(
+            os.path.join(tmp_dir, "lengths.npy"),
+            np.array([row[2] for row in rows], np.int64),
+        )
+        write_meta(
+            tmp_dir, source_path, source_stat, REDDIT_INDEX_VERSION, dates=dates
+        )
+        swap_in(tmp_dir, store_dir)
+
+    @classmethod
+    def open(cls, store_dir: str) -> "RedditIndex":
+        with open(os.path.join(store_dir, "meta.json")) as f:
+            meta = json.load(f)
+
+        def _load(name):
+            return np.load(os.path.join(store_dir, name))
+
+        return cls(
+            meta["source_path"],
+            meta["dates"],
+            _load("day_offsets.npy"),
+            _load("offsets.npy"),
+            _load("lengths.npy"),
+        )
+
+
+def _store_dir_for(source_path: str) -> str:
+    category = os.path.basename(os.path.dirname(os.path.abspath(source_path)))
+    store_root = os.path.join(get_config()["data_cache_dir"], "reddit_index")
+    return os.path.join(store_root, category, store_name(source_path))
+
+
+_open_indexes: StoreCache[RedditIndex] = StoreCache()
+
+
+def get_reddit_index(
+    source_path: Annotated[str, "path of a subreddit .jsonl file"],
+) -> RedditIndex:
+    """Return the index of ``source_path``, building it on first use and
+    whenever the file changes."""
+    return _open_indexes.get(
+        source_path,
+        lambda source_path, source_stat: open_or_build(
+            _store_dir_for(source_path),
+            source_path,
+            source_stat,
+            REDDIT_INDEX_VERSION,
+            RedditIndex.build,
+            RedditIndex.open,
+        ),
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_company_pattern(ticker: str, company: str) -> "re.Pattern":
+    search_terms = []
+    if "OR" in company:
+        search_terms = company.split(" OR ")
+    else:
+        search_terms = [company]
+
+    search_terms.append(ticker)
+
+    # a post matches when any of the terms does, so they can share one pattern
+    return re.compile(
+        "|".join(f"(?:{term})" for term in search_terms), re.IGNORECASE
+    )
+
+
+def company_matcher(ticker: Annotated[str, "ticker symbol in ticker_to_company"]):
+    """Compiled pattern matching any search term of ``ticker``: the company
+    names in ``ticker_to_company`` (split on " OR ") and the ticker itself,
+    case-insensitively. Compiled once per ticker and name."""
+    return _compile_company_pattern(ticker, ticker_to_company[ticker])
+
+
+def _top_posts(
+    index: RedditIndex,
+    start_date: str,
+    end_date: str,
+    limit: int,
+    query: Optional[str],
+) -> Dict[str, List[dict]]:
+    """Best ``limit`` posts of every day of the window in one subreddit, most
+    upvoted first and ties in file order; only posts mentioning the company
+    of ``query`` count when it is given."""
+    matcher = company_matcher(query) if query else None
+
+    # date -> min-heap of (upvotes, -position, post); on equal upvotes the
+    # later post is the smaller entry, so the earliest one is kept
+    heaps: Dict[str, List[Tuple]] = {}
+    for position, (post_date, parsed_line) in enumerate(
+        index.range(start_date, end_date)
+    ):
+        if matcher is not None and not (
+            matcher.search(parsed_line["title"])
+            or matcher.search(parsed_line["selftext"])
+        ):
+            continue
+
+        heap = heaps.setdefault(post_date, [])
+        entry = (parsed_line["ups"], -position, parsed_line)
+        if len(heap) < limit:
+            heapq.heappush(heap, entry)
+        elif entry[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, entry)
+
+    return {
+        post_date: [
+            {
+                "title": parsed_line["title"],
+                "content": parsed_line["selftext"],
+                "url": parsed_line["url"],
+                "upvotes": upvotes,
+                "posted_date": post_date,
+            }
+            for upvotes, _, parsed_line in sorted(
+                heap, key=lambda entry: entry[:2], reverse=True
+            )
+        ]
+        for post_date, heap in sorted(heaps.items())
+    }
+
+
+def _top_posts_in_worker(
+    store_dir: str, start_date: str, end_date: str, limit: int, query: Optional[str]
+) -> Dict[str, List[dict]]:
+    # indexes are built by the parent before the scan, workers only open them
+    return _top_posts(RedditIndex.open(store_dir), start_date, end_date, limit, query)
+
+
+_scan_pool: Optional[ProcessPoolExecutor] = None
+_scan_pool_workers = 0
+_scan_pool_lock = threading.Lock()
+
+
+def _get_scan_pool(workers: int) -> ProcessPoolExecutor:
+    """Process pool shared by the parallel scans, resized when the
+    ``reddit_scan_workers`` config changes."""
+    global _scan_pool, _scan_pool_workers
+    with _scan_pool_lock:
+        if _scan_pool is None or _scan_pool_workers != workers:
+            if _scan_pool is not None:
+                _scan_pool.shutdown(wait=False)
+            # the caller runs threads of its own, which forking could deadlock;
+            # workers only need a store directory, so they can start fresh
+            _scan_pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            _scan_pool_workers = workers
+        return _scan_pool
+
+
+def _reset_scan_pool():
+    global _scan_pool
+    with _scan_pool_lock:
+        if _scan_pool is not None:
+            _scan_pool.shutdown(wait=False)
+        _scan_pool = None
+
+
+def fetch_top_from_category_range(
     category: Annotated[
         str, "Category to fetch top post from. Collection of subreddits."
     ],
-    date: Annotated[str, "Date to fetch top posts from."],
-    max_limit: Annotated[int, "Maximum number of posts to fetch."],
+    start_date: Annotated[str, "First date to fetch top posts from, yyyy-mm-dd."],
+    end_date: Annotated[str, "Last date to fetch top posts from, yyyy-mm-dd."],
+    max_limit: Annotated[int, "Maximum number of posts to fetch per day."],
     query: Annotated[str, "Optional query to search for in the subreddit."] = None,
     data_path: Annotated[
         str,
         "Path to the data folder. Default is 'reddit_data'.",
     ] = "reddit_data",
-):
+    workers: Annotated[
+        Optional[int], "processes scanning in parallel, 1 scans serially"
+    ] = None,
+) -> Dict[str, List[dict]]:
+    """
+    Top posts of every day of ``[start_date, end_date]``, from one pass over
+    each subreddit file of the category.
+    Each (subreddit, date) keeps its best ``max_limit // number of files``
+    posts in a bounded min-heap, so memory does not grow with the window.
+    With more than one worker (``workers``, by default the
+    ``reddit_scan_workers`` config), the subreddits, and long windows of a
+    subreddit split into runs of whole days, are scanned in a process pool
+    and their top posts merged; the scan falls back to serial if the pool
+    breaks.
+    Returns, for each date with posts, the list ``fetch_top_from_category``
+    gives for that date: subreddit by subreddit, most upvoted first, ties in
+    file order.
+    """
     base_path = data_path
 
-    all_content = []
-
     if max_limit < len(os.listdir(os.path.join(base_path, category))):
         raise ValueError(
             "REDDIT FETCHING ERROR: max limit is less than the number of files in the category. Will not be able to fetch any posts"
@@ -74,62 +398,70 @@ def fetch_top_from_category(
         os.listdir(os.path.join(base_path, category))
     )
 
+    # if is company_news, keep only posts that mention the company (query)
+    query = query if "company" in category else None
+
+    # (index, first date, last date) of every scan, in subreddit order
+    scans = []
     for data_file in os.listdir(os.path.join(base_path, category)):
         # check if data_file is a .jsonl file
         if not data_file.endswith(".jsonl"):
             continue
 
-        all_content_curr_subreddit = []
-
-        with open(os.path.join(base_path, category, data_file), "rb") as f:
-            for i, line in enumerate(f):
-                # skip empty lines
-                if not line.strip():
-                    continue
-
-                parsed_line = json.loads(line)
-
-                # select only lines that are from the date
-                post_date = datetime.utcfromtimestamp(
-                    parsed_line["created_utc"]
-                ).strftime("%Y-%m-%d")
-                if post_date != date:
-                    continue
+        index = get_reddit_index(os.path.join(base_path, category, data_file))
+        for span_start, span_end in index.split(
+            start_date, end_date, REDDIT_SCAN_CHUNK_ROWS
+        ):
+            scans.append((index, span_start, span_end))
 
-                # if is company_news, check that the title or the content has the company's name (query) mentioned
-                if "company" in category and query:
-                    search_terms = []
-                    if "OR" in ticker_to_company[query]:
-                        search_terms = ticker_to_company[query].split(" OR ")
-                    else:
-                        search_terms = [ticker_to_company[query]]
+    if workers is None:
+        workers = get_config()["reddit_scan_workers"]
 
-                    search_terms.append(query)
+    results = None
+    if workers > 1 and len(scans) > 1:
+        try:
+            pool = _get_scan_pool(workers)
+            futures = [
+                pool.submit(
+                    _top_posts_in_worker,
+                    _store_dir_for(index.source_path),
+                    span_start,
+                    span_end,
+                    limit_per_subreddit,
+                    query,
+                )
+                for index, span_start, span_end in scans
+            ]
+            results = [future.result() for future in futures]
+        except (OSError, BrokenProcessPool) as e:
+            print(f"Reddit scan: process pool failed ({e}), scanning serially")
+            _reset_scan_pool()
+    if results is None:
+        results = [
+            _top_posts(index, span_start, span_end, limit_per_subreddit, query)
+            for index, span_start, span_end in scans
+        ]
 
-                    found = False
-                    for term in search_terms:
-                        if re.search(
-                            term, parsed_line["title"], re.IGNORECASE
-                        ) or re.search(term, parsed_line["selftext"], re.IGNORECASE):
-                            found = True
-                            break
+    all_content: Dict[str, List[dict]] = {}
+    for top_posts in results:
+        for post_date, posts in top_posts.items():
+            all_content.setdefault(post_date, []).extend(posts)
 
-                    if not found:
-                        continue
+    return dict(sorted(all_content.items()))
 
-                post = {
-                    "title": parsed_line["title"],
-                    "content": parsed_line["selftext"],
-                    "url": parsed_line["url"],
-                    "upvotes": parsed_line["ups"],
-                    "posted_date": post_date,
-                }
 
-                all_content_curr_subreddit.append(post)
-
-        # sort all_content_curr_subreddit by upvote_ratio in descending order
-        all_content_curr_subreddit.sort(key=lambda x: x["upvotes"], reverse=True)
-
-        all_content.extend(all_content_curr_subreddit[:limit_per_subreddit])
-
-    return all_content
+def fetch_top_from_category(
+    category: Annotated[
+        str, "Category to fetch top post from. Collection of subreddits."
+    ],
+    date: Annotated[str, "Date to fetch top posts from."],
+    max_limit: Annotated[int, "Maximum number of posts to fetch."],
+    query: Annotated[str, "Optional query to search for in the subreddit."] = None,
+    data_path: Annotated[
+        str,
+        "Path to the data folder. Default is 'reddit_data'.",
+    ] = "reddit_data",
+):
+    return fetch_top_from_category_range(
+        category, date, date, max_limit, query, data_path
+    ).get(date, [])
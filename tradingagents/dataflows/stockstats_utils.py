@@ -1,21 +1,19 @@
+import numpy as np
 import pandas as pd
-import yfinance as yf
 from stockstats import wrap
-from typing import Annotated
+from typing import Annotated, Tuple
 import os
+from . import indicator_engine
 from .config import get_config
+from .indicator_cache import get_indicator_cache
+from .price_cache import get_cached_price_file
+from .price_store import PriceStore, get_price_store, yfin_csv_path
 
 
 class StockstatsUtils:
     @staticmethod
-    def get_stock_stats(
+    def get_price_file(
         symbol: Annotated[str, "ticker symbol for the company"],
-        indicator: Annotated[
-            str, "quantitative indicators based off of the stock data for the company"
-        ],
-        curr_date: Annotated[
-            str, "curr date for retrieving stock price data, YYYY-mm-dd"
-        ],
         data_dir: Annotated[
             str,
             "directory where the stock data is stored.",
@@ -24,64 +22,126 @@ class StockstatsUtils:
             bool,
             "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
         ] = False,
-    ):
-        df = None
-        data = None
-
+    ) -> str:
+        """Path of the price CSV backing a symbol, downloading it first in online mode."""
         if not online:
-            try:
-                data = pd.read_csv(
-                    os.path.join(
-                        data_dir,
-                        f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-                    )
-                )
-                df = wrap(data)
-            except FileNotFoundError:
+            data_file = yfin_csv_path(symbol, data_dir)
+            if not os.path.exists(data_file):
                 raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
-        else:
-            # Get today's date as YYYY-mm-dd to add to cache
-            today_date = pd.Timestamp.today()
-            curr_date = pd.to_datetime(curr_date)
+            return data_file
 
-            end_date = today_date
-            start_date = today_date - pd.DateOffset(years=15)
-            start_date = start_date.strftime("%Y-%m-%d")
-            end_date = end_date.strftime("%Y-%m-%d")
+        # one incrementally updated file per symbol, see price_cache
+        return get_cached_price_file(symbol)
+
+    @staticmethod
+    def get_indicator_column(
+        symbol: Annotated[str, "ticker symbol for the company"],
+        indicator: Annotated[
+            str, "quantitative indicators based off of the stock data for the company"
+        ],
+        data_dir: Annotated[
+            str,
+            "directory where the stock data is stored.",
+        ],
+        online: Annotated[
+            bool,
+            "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
+        ] = False,
+    ) -> Tuple[PriceStore, np.ndarray]:
+        """Return ``(store, values)`` where ``values`` is the full indicator
+        series aligned with the rows of the symbol's price store, whose
+        ``dates`` index is used for lookups. Served from the process-wide
+        indicator cache, keyed by the symbol, the indicator, the backend and
+        the version of the price file. The ``indicator_backend`` config picks
+        stockstats or the vectorized numpy engine; indicators the engine does
+        not cover always go through stockstats."""
+        data_file = StockstatsUtils.get_price_file(symbol, data_dir, online)
+        store = get_price_store(data_file)
+        backend = get_config()["indicator_backend"]
+        if backend == "numpy" and not indicator_engine.is_supported(indicator):
+            backend = "stockstats"
+        key = (
+            symbol,
+            indicator,
+            backend,
+            os.path.abspath(data_file),
+            *store.version,
+        )
 
-            # Get config and ensure cache directory exists
-            config = get_config()
-            os.makedirs(config["data_cache_dir"], exist_ok=True)
+        cache = get_indicator_cache()
+        cached = cache.get(key)
+        if cached is not None:
+            return store, cached[0]
 
-            data_file = os.path.join(
-                config["data_cache_dir"],
-                f"{symbol}-YFin-data-{start_date}-{end_date}.csv",
+        if backend == "numpy":
+            values = indicator_engine.compute_indicator(
+                indicator,
+                store.column("Close"),
+                store.column("High"),
+                store.column("Low"),
+                store.column("Volume"),
             )
+        else:
+            df = wrap(store.frame())
+            values = np.asarray(df[indicator].values)  # trigger stockstats to calculate
 
-            if os.path.exists(data_file):
-                data = pd.read_csv(data_file)
-                data["Date"] = pd.to_datetime(data["Date"])
-            else:
-                data = yf.download(
-                    symbol,
-                    start=start_date,
-                    end=end_date,
-                    multi_level_index=False,
-                    progress=False,
-                    auto_adjust=True,
-                )
-                data = data.reset_index()
-                data.to_csv(data_file, index=False)
-
-            df = wrap(data)
-            df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-            curr_date = curr_date.strftime("%Y-%m-%d")
+        cache.put(key, (values,))
+        return store, values
 
-        df[indicator]  # trigger stockstats to calculate the indicator
-        matching_rows = df[df["Date"].str.startswith(curr_date)]
+    @staticmethod
+    def get_stock_stats(
+        symbol: Annotated[str, "ticker symbol for the company"],
+        indicator: Annotated[
+            str, "quantitative indicators based off of the stock data for the company"
+        ],
+        curr_date: Annotated[
+            str, "curr date for retrieving stock price data, YYYY-mm-dd"
+        ],
+        data_dir: Annotated[
+            str,
+            "directory where the stock data is stored.",
+        ],
+        online: Annotated[
+            bool,
+            "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
+        ] = False,
+    ):
+        store, values = StockstatsUtils.get_indicator_column(
+            symbol, indicator, data_dir, online
+        )
+        row = store.locate(curr_date)
 
-        if not matching_rows.empty:
-            indicator_value = matching_rows[indicator].values[0]
+        if row is not None:
+            indicator_value = values[row]
             return indicator_value
         else:
             return "N/A: Not a trading day (weekend or holiday)"
+
+    @staticmethod
+    def get_stock_stats_window(
+        symbol: Annotated[str, "ticker symbol for the company"],
+        indicator: Annotated[
+            str, "quantitative indicators based off of the stock data for the company"
+        ],
+        start_date: Annotated[str, "first date of the window, YYYY-mm-dd"],
+        end_date: Annotated[str, "last date of the window, YYYY-mm-dd"],
+        data_dir: Annotated[
+            str,
+            "directory where the stock data is stored.",
+        ],
+        online: Annotated[
+            bool,
+            "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
+        ] = False,
+    ) -> pd.Series:
+        """Indicator values for every trading day between start_date and end_date
+        (inclusive), indexed by yyyy-mm-dd. The series is loaded and the
+        indicator computed once for the whole window."""
+        store, values = StockstatsUtils.get_indicator_column(
+            symbol, indicator, data_dir, online
+        )
+        lo, hi = store.bounds(start_date, end_date)
+
+        window = pd.Series(values[lo:hi], index=store.dates[lo:hi].astype(str))
+        # keep the first row of a day, as the single-date lookup does
+        return window[~window.index.duplicated()]
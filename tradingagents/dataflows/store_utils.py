@@ -0,0 +1,148 @@
+"""Building blocks shared by the stores compiled from the raw data files.
+
+A store is a directory of arrays with a ``meta.json`` recording the layout
+version of the store and the mtime and size of the source it was built
+from. Each store module keeps its own version and bumps it whenever its
+layout changes, so :func:`meta_is_current` makes stale stores rebuild. A
+store is written to a temporary directory and swapped in whole, so readers
+never see a half-written one. Opened stores are shared in the process
+through a :class:`StoreCache`.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from typing import Annotated, Callable, Dict, Generic, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+def store_name(source_path: str) -> str:
+    """Directory name of the store of ``source_path``: the file name plus a
+    short hash of its absolute path, so same-named files of different data
+    directories get stores of their own."""
+    source_path = os.path.abspath(source_path)
+    name = os.path.splitext(os.path.basename(source_path))[0]
+    digest = hashlib.sha1(source_path.encode()).hexdigest()[:10]
+    return f"{name}-{digest}"
+
+
+def make_tmp_dir(store_dir: str) -> str:
+    """Empty directory to build ``store_dir`` in before :func:`swap_in`."""
+    tmp_dir = f"{store_dir}.tmp{os.getpid()}.{threading.get_ident()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    return tmp_dir
+
+
+def swap_in(tmp_dir: str, store_dir: str):
+    shutil.rmtree(store_dir, ignore_errors=True)
+    os.replace(tmp_dir, store_dir)
+
+
+def write_meta(
+    tmp_dir: str,
+    source_path: str,
+    source_stat: os.stat_result,
+    version: Annotated[int, "layout version of the store"],
+    **fields,
+):
+    """Write ``meta.json`` describing the source, plus store specific ``fields``."""
+    meta = {
+        "version": version,
+        "source_path": os.path.abspath(source_path),
+        "source_mtime_ns": source_stat.st_mtime_ns,
+        "source_size": source_stat.st_size,
+        **fields,
+    }
+    with open(os.path.join(tmp_dir, "meta.json"), "w") as f:
+        json.dump(meta, f)
+
+
+def meta_is_current(
+    store_dir: str, source_path: str, source_stat: os.stat_result, version: int
+) -> bool:
+    """Whether ``store_dir/meta.json`` describes this version of the source."""
+    try:
+        with open(os.path.join(store_dir, "meta.json")) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return (
+        meta.get("version") == version
+        and meta.get("source_path") == os.path.abspath(source_path)
+        and meta.get("source_mtime_ns") == source_stat.st_mtime_ns
+        and meta.get("source_size") == source_stat.st_size
+    )
+
+
+def open_or_build(
+    store_dir: str,
+    source_path: str,
+    source_stat: os.stat_result,
+    version: int,
+    build: Callable[[str, str, os.stat_result], None],
+    open_store: Callable[[str], T],
+) -> T:
+    """Open the store in ``store_dir``, building it first when it is missing
+    or was built from another version of the source or layout."""
+    if not meta_is_current(store_dir, source_path, source_stat, version):
+        os.makedirs(os.path.dirname(store_dir), exist_ok=True)
+        build(source_path, store_dir, source_stat)
+    return open_store(store_dir)
+
+
+class StoreCache(Generic[T]):
+    """Stores opened in this process, one per source file.
+
+    A cached store is returned while its source keeps the mtime and size it
+    was loaded at, and is loaded again otherwise. Sources load under a lock
+    of their own, so different files load in parallel while concurrent
+    callers of one file wait for a single load.
+    """
+
+    def __init__(self):
+        self._stores: Dict[str, Tuple[int, int, T]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        source_path: str,
+        load: Annotated[
+            Callable[[str, os.stat_result], Optional[T]],
+            "loads the store of (source_path, source_stat); None is not cached",
+        ],
+    ) -> Optional[T]:
+        source_stat = os.stat(source_path)  # raises FileNotFoundError like open
+        key = os.path.abspath(source_path)
+        version = (source_stat.st_mtime_ns, source_stat.st_size)
+
+        with self._lock:
+            key_lock = self._locks.setdefault(key, threading.Lock())
+        with key_lock:
+            cached = self._stores.get(key)
+            if cached is not None and cached[:2] == version:
+                return cached[2]
+            store = load(source_path, source_stat)
+            if store is not None:
+                with self._lock:
+                    self._stores[key] = (*version, store)
+            return store
+
+    def invalidate(self, source_path: str):
+        """Forget the store of ``source_path``, so the next :meth:`get` loads
+        it again whatever its mtime and size. Waits for a load in progress."""
+        key = os.path.abspath(source_path)
+        with self._lock:
+            key_lock = self._locks.setdefault(key, threading.Lock())
+        with key_lock, self._lock:
+            self._stores.pop(key, None)
+
+    def peek(self, source_path: str) -> Optional[T]:
+        """The store loaded for ``source_path``, current or not, if any."""
+        with self._lock:
+            cached = self._stores.get(os.path.abspath(source_path))
+        return None if cached is None else cached[2]
@@ -0,0 +1,80 @@
+import threading
+import weakref
+from typing import Annotated, Iterator, Optional
+
+import numpy as np
+
+from .price_store import PriceStore, to_day, get_price_store
+
+
+class TradingCalendar:
+    """Sorted index of trading sessions.
+
+    Sessions come from the bars of a price store, so the calendar follows the
+    exchange the symbol trades on. A window lookup is two bisects plus a
+    slice, so it costs O(log n + window) and never touches weekends or
+    holidays.
+    """
+
+    def __init__(self, sessions: np.ndarray):
+        self.sessions = np.unique(np.asarray(sessions, dtype="datetime64[D]"))
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def __contains__(self, day) -> bool:
+        return self.is_session(day)
+
+    def is_session(self, day) -> bool:
+        day = to_day(day)
+        i = int(np.searchsorted(self.sessions, day))
+        return i < len(self.sessions) and self.sessions[i] == day
+
+    def sessions_between(
+        self,
+        start_date: Annotated[Optional[str], "first day (inclusive), yyyy-mm-dd"],
+        end_date: Annotated[Optional[str], "last day (inclusive), yyyy-mm-dd"],
+    ) -> np.ndarray:
+        """Trading sessions in ``[start_date, end_date]``, oldest first."""
+        lo = 0 if start_date is None else np.searchsorted(
+            self.sessions, to_day(start_date), side="left"
+        )
+        hi = len(self.sessions) if end_date is None else np.searchsorted(
+            self.sessions, to_day(end_date), side="right"
+        )
+        return self.sessions[lo:hi]
+
+    def iter_sessions(
+        self,
+        start_date: Annotated[Optional[str], "first day (inclusive), yyyy-mm-dd"],
+        end_date: Annotated[Optional[str], "last day (inclusive), yyyy-mm-dd"],
+        reverse: bool = False,
+    ) -> Iterator[str]:
+        """Yield the sessions of a window as yyyy-mm-dd strings."""
+        sessions = self.sessions_between(start_date, end_date)
+        if reverse:
+            sessions = sessions[::-1]
+        yield from sessions.astype(str)
+
+    @classmethod
+    def from_price_store(cls, store: PriceStore) -> "TradingCalendar":
+        return cls(store.dates)
+
+
+_calendars: "weakref.WeakKeyDictionary[PriceStore, TradingCalendar]" = (
+    weakref.WeakKeyDictionary()
+)
+_calendars_lock = threading.Lock()
+
+
+def get_trading_calendar(
+    price_file: Annotated[str, "path of the price CSV the sessions come from"],
+) -> TradingCalendar:
+    """Calendar built once per version of a price file and reused afterwards."""
+    store = get_price_store(price_file)
+    with _calendars_lock:
+        calendar = _calendars.get(store)
+        if calendar is None:
+            calendar = TradingCalendar.from_price_store(store)
+            _calendars[store] = calendar
+        return calendar
@@ -4,17 +4,32 @@ import yfinance as yf
 from typing import Annotated, Callable, Any, Optional
 from pandas import DataFrame
 import pandas as pd
-from functools import wraps
+from datetime import date
+from functools import lru_cache, wraps
 
 from .utils import save_output, SavePathType, decorate_all_methods
 
 
+@lru_cache(maxsize=512)
+def _ticker_of_day(symbol: str, day: date) -> yf.Ticker:
+    return yf.Ticker(symbol)
+
+
+def get_ticker(symbol: Annotated[str, "ticker symbol"]) -> yf.Ticker:
+    """Shared yf.Ticker per symbol, so its session and metadata are reused.
+
+    A Ticker keeps the info, financials and recommendations it fetched, so
+    it is only shared within a day; the next day gets a fresh one.
+    """
+    return _ticker_of_day(symbol, date.today())
+
+
 def init_ticker(func: Callable) -> Callable:
     """Decorator to initialize yf.Ticker and pass it to the function."""
 
     @wraps(func)
     def wrapper(symbol: Annotated[str, "ticker symbol"], *args, **kwargs) -> Any:
-        ticker = yf.Ticker(symbol)
+        ticker = get_ticker(symbol)
         return func(ticker, *args, **kwargs)
 
     return wrapper
@@ -2,8 +2,6 @@ import os
 
 DEFAULT_CONFIG = {
     "project_dir": os.path.abspath(os.path.join(os.path.dirname(__file__), ".")),
-     revert-47-docker-ollama
-
     "data_dir": "/Users/yluo/Documents/Code/ScAI/FR1-data",
     "data_cache_dir": os.path.join(
         os.path.abspath(os.path.join(os.path.dirname(__file__), ".")),
@@ -20,4 +18,23 @@ DEFAULT_CONFIG = {
     "max_recur_limit": 100,
     # Tool settings
     "online_tools": True,
+    "indicator_backend": "stockstats",  # "stockstats" or "numpy"
+    "reddit_scan_workers": 1,  # > 1 scans subreddit files in a process pool
+    # Google News scraping settings
+    "google_news_base_url": "https://www.google.com/search",
+    "google_news_requests_per_second": 1.0,  # shared by all queries of the process
+    "google_news_burst": 3,
+    "google_news_page_concurrency": 3,
+    "google_news_today_ttl_seconds": 60 * 60,  # past days are cached for good
+    # News feed settings
+    "news_provider": "google_search",  # "google_search" or "feeds" (RSS/Atom)
+    "google_news_rss_url": "https://news.google.com/rss/search",
+    "news_feed_urls": [],  # publisher feeds searched next to Google News
+    # Tool output settings
+    "tool_output_precision": 2,
+    "tool_output_indicator_precision": 4,
+    "tool_output_delta": False,
+    "tool_output_token_budget": None,  # e.g. 2000 to downsample long tables
+    # Cache settings
+    "indicator_cache_max_bytes": 128 * 1024 * 1024,
 }
@@ -135,6 +135,7 @@ class TradingAgentsGraph:
                     # online tools
                     self.toolkit.get_global_news_openai,
                     self.toolkit.get_google_news,
+                    self.toolkit.get_feed_news,
                     # offline tools
                     self.toolkit.get_finnhub_news,
                     self.toolkit.get_reddit_news,
@@ -145,15 +146,15 @@ class TradingAgentsGraph:
                     # online tools
                     self.toolkit.get_fundamentals_openai,
                     # offline tools
-                    self.toolkit.get_finnhub_company_insider_sentiment,
-                    self.toolkit.get_finnhub_company_insider_transactions,
-                    self.toolkit.get_simfin_balance_sheet,
-                    self.toolkit.get_simfin_cashflow,
-                    self.toolkit.get_simfin_income_stmt,
+                    self.toolkit.get_fundamentals_bundle,
                 ]
             ),
         }
 
+    def prefetch(self, company_names: List[str]):
+        """Prefetch market data for a batch of companies before propagating them."""
+        return self.toolkit.prefetch_market_data(company_names)
+
     def propagate(self, company_name, trade_date):
         """Run the trading agents graph for a company on a specific date."""
 